@@ -0,0 +1,62 @@
+"""Import-time benchmark for the lightweight core module.
+
+Imports sar_snowmelt_timing.core in fresh interpreters, reports the best wall time and fails if it exceeds a budget or if any
+plotting / ancillary-data dependency was pulled in at import. Run from the repository root:
+
+    python benchmarks/import_time.py [--budget 1.5] [--repeat 5]
+"""
+
+import argparse
+import subprocess
+import sys
+
+# modules that must never be imported by `import sar_snowmelt_timing.core`
+HEAVY_MODULES = ['matplotlib', 'hvplot', 'contextily', 'ulmo', 'py3dep', 'pystac_client', 'pystac', 'stackstac',
+                 'dask.distributed', 'scipy', 'geopandas', 'rasterio', 'rioxarray', 'shapely']
+
+CHILD = '''
+import sys, time
+t0 = time.perf_counter()
+import sar_snowmelt_timing.core
+elapsed = time.perf_counter() - t0
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed)
+print(','.join(heavy))
+'''
+
+
+def time_import(repeat=5):
+    '''
+    Returns the best import time of sar_snowmelt_timing.core over several fresh interpreters and any heavy modules it loaded.
+
+            Parameters:
+                    repeat (int): number of fresh interpreters to time
+
+            Returns:
+                    best (float): fastest import time [s]
+                    heavy (list): heavy modules found in sys.modules after the import
+    '''
+    times = []
+    heavy = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', CHILD.format(heavy=HEAVY_MODULES)], capture_output=True, text=True, check=True).stdout.split('\n')
+        times.append(float(out[0]))
+        heavy = [m for m in out[1].split(',') if m]
+    return min(times), heavy
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--budget', type=float, default=1.5, help='maximum allowed import time [s]')
+    parser.add_argument('--repeat', type=int, default=5, help='number of fresh interpreters to time')
+    args = parser.parse_args()
+
+    best, heavy = time_import(args.repeat)
+    print(f'import sar_snowmelt_timing.core: {best:.3f} s (budget {args.budget:.3f} s)')
+    if heavy:
+        print(f'FAIL: heavy modules imported by core: {", ".join(heavy)}')
+        sys.exit(1)
+    if best > args.budget:
+        print('FAIL: import time over budget')
+        sys.exit(1)
+    print('OK')
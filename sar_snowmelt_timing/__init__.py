@@ -0,0 +1,24 @@
+"""Tools for exploring snowmelt timing using Sentinel-1 C-band SAR.
+
+Submodules are imported lazily on first attribute access, so `import sar_snowmelt_timing` stays cheap:
+
+    core          -- backscatter loading, dB/quantization and onset computation (numpy/pandas/xarray only)
+    ancillary     -- DEM, SNOTEL and Sentinel-2 data matched to a backscatter stack
+    plotting      -- matplotlib/contextily figures
+    validation    -- offline comparison of onset maps with SNOTEL melt-out dates
+    s1_rtc_bs_utils -- backwards-compatible module re-exporting all of the above
+"""
+
+import importlib
+
+_SUBMODULES = ('core', 'ancillary', 'plotting', 'validation', 's1_rtc_bs_utils')
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_SUBMODULES))
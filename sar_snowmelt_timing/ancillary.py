@@ -0,0 +1,467 @@
+"""Functions to fetch ancillary data (3DEP DEM and terrain, SNOTEL, Sentinel-2) matched to a Sentinel-1 backscatter stack.
+
+Author: Eric Gagliano (egagli@uw.edu)
+Updated: 10/2026
+"""
+
+import os
+import pystac_client
+import stackstac
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import rioxarray
+import ulmo
+from datetime import datetime
+import py3dep
+import rasterio as rio
+import shapely
+from functools import cached_property
+
+from .core import get_runoff_onset, dequantize_backscatter
+
+def get_median_ndvi(ts_ds,start_time='2020-07-30',end_time='2020-09-09'):
+    '''
+    Returns the median ndvi of the area covered by a given xarray dataset using Sentinel 2 imagery given a specific temporal window. Good for building an ndvi mask.
+
+            Parameters:
+                    ts_ds (xarray dataset): the area we will return the median ndvi over
+                    start_time (str): start time of returned data 'YYYY-MM-DD'
+                    end_time (str): end time of returned data 'YYYY-MM-DD'
+
+            Returns:
+                    frames_ndvi_compute (xarray dataset): computed ndvi median of the Sentinel 2 stack, reprojected to the same grid as the input dataset
+    '''
+    # go from ds to lat lon here
+    ds_4326 = ts_ds.rio.reproject('EPSG:4326', resampling=rio.enums.Resampling.cubic)
+    box = shapely.geometry.box(*ds_4326.rio.bounds())
+    bbox_gdf = gpd.GeoDataFrame(index=[0], crs='epsg:4326', geometry=[box])
+    # must be lat lot bounding box
+    lower_lon, upper_lat, upper_lon, lower_lat = bbox_gdf.bounds.values[0]
+    #lower_lon, upper_lat, upper_lon, lower_lat = gdf.geometry.total_bounds
+
+    lon = (lower_lon + upper_lon)/2
+    lat = (lower_lat + upper_lat)/2
+    
+    URL = "https://earth-search.aws.element84.com/v0"
+    catalog = pystac_client.Client.open(URL)
+    
+    items = catalog.search(
+    intersects=dict(type="Point", coordinates=[lon, lat]),
+    collections=["sentinel-s2-l2a-cogs"],
+    datetime=f"{start_time}/{end_time}").get_all_items()
+    
+    string = f'{ts_ds.rio.crs}'
+    epsg_code = int(string[5:])
+    
+    stack = stackstac.stack(items,epsg=epsg_code)
+    
+    if np.unique(stack['proj:epsg']).size>1:
+        stack = stack[stack['proj:epsg']!=stack['epsg']]
+    
+    bounding_box_utm_gf = bbox_gdf.to_crs(stack.crs)
+    xmin, ymax, xmax, ymin = bounding_box_utm_gf.bounds.values[0]
+
+    cloud_cover_threshold = 20
+    lowcloud = stack[stack["eo:cloud_cover"] < cloud_cover_threshold]
+
+    nir, red, = lowcloud.sel(band="B08"), lowcloud.sel(band="B04")
+    ndvi = (nir-red)/(nir+red)
+    
+    #if np.unique(ndvi['proj:epsg']).size>1:
+    #    try:
+    #        ndvi = ndvi[ndvi['proj:epsg']==ndvi['proj:epsg'][1]].compute()
+    #    except: 
+    #        ndvi = ndvi[ndvi['proj:epsg']==ndvi['proj:epsg'][0]].compute()
+    #else:
+    #    ndvi = ndvi.compute()
+    
+    time_slice_ndvi = slice(start_time,end_time)
+    scenes_ndvi = ndvi.sel(x=slice(xmin,xmax),y=slice(ymin,ymax)).sel(time=time_slice_ndvi).median("time", keep_attrs=True)
+    scenes_ndvi = scenes_ndvi.rio.write_crs(stack.rio.crs)
+    frames_ndvi_compute = scenes_ndvi.rio.reproject_match(ts_ds).compute()
+    return frames_ndvi_compute
+
+def get_py3dep_dem(ts_ds):
+    ds_4326 = ts_ds.rio.reproject('EPSG:4326', resampling=rio.enums.Resampling.cubic)
+    bbox = ds_4326.rio.bounds()
+    dem = py3dep.get_map("DEM", bbox, resolution=10, geo_crs="epsg:4326", crs="epsg:3857")
+    dem.name = "dem"
+    dem.attrs["units"] = "meters"
+    dem_reproject = dem.rio.reproject_match(ts_ds) 
+    return dem_reproject
+
+def get_py3dep_aspect(ts_ds):
+    ds_4326 = ts_ds.rio.reproject('EPSG:4326', resampling=rio.enums.Resampling.cubic)
+    bbox = ds_4326.rio.bounds()
+    dem = py3dep.get_map("Aspect Degrees", bbox, resolution=10, geo_crs="epsg:4326", crs="epsg:3857")
+    dem.name = "aspect"
+    dem.attrs["units"] = "degrees"
+    dem_reproject = dem.rio.reproject_match(ts_ds)
+    return dem_reproject
+
+def get_py3dep_slope(ts_ds):
+    ds_4326 = ts_ds.rio.reproject('EPSG:4326', resampling=rio.enums.Resampling.cubic)
+    bbox = ds_4326.rio.bounds()
+    dem = py3dep.get_map("Slope Degrees", bbox, resolution=10, geo_crs="epsg:4326", crs="epsg:3857")
+    dem.name = "slope"
+    dem.attrs["units"] = "degrees"
+    dem_reproject = dem.rio.reproject_match(ts_ds) 
+    return dem_reproject
+
+def get_dah(ts_ds):
+    # Diurnal Anisotropic Heating Index [Böhner and Antonić, 2009]
+    # https://www.sciencedirect.com/science/article/abs/pii/S0166248108000081
+    # DAH = cos(alpha_max-alpha)*arctan(beta) where alpha_max is slope aspect 
+    # recieving maximum heating alpha is slope aspect, beta is slope aspect
+    # in radians. adpated from: https://agupubs.onlinelibrary.wiley.com/doi/full/10.1002/2017WR020799
+    # https://avalanche.org/avalanche-encyclopedia/aspect/
+    alpha_max = 202.5
+    aspect = get_py3dep_aspect(ts_ds)
+    slope = get_py3dep_slope(ts_ds)
+    DAH = np.cos(np.deg2rad(alpha_max-aspect))*np.arctan(np.deg2rad(slope))
+    DAH_reproject = DAH.rio.reproject_match(ts_ds)
+    return DAH_reproject
+
+def find_closest_snotel(ts_ds):
+    
+    sites_df=pd.DataFrame.from_dict(ulmo.cuahsi.wof.get_sites('https://hydroportal.cuahsi.org/Snotel/cuahsi_1_1.asmx?WSDL'),orient='index').astype({'elevation_m': 'float'})
+    locations = pd.json_normalize(sites_df['location']).astype({'latitude': 'float','longitude':'float'})
+    sites_gdf = gpd.GeoDataFrame(sites_df[['code','name','elevation_m']], geometry=gpd.points_from_xy(locations.longitude, locations.latitude))
+    
+    sites_gdf = sites_gdf.set_crs('epsg:4326')
+    sites_gdf = sites_gdf.to_crs(ts_ds.rio.crs)
+    
+    sites_gdf['distance_km'] = sites_gdf.distance(shapely.geometry.box(*ts_ds.rio.bounds()))/1000
+    sites_gdf = sites_gdf.sort_values(by='distance_km')
+    sites_gdf = sites_gdf[sites_gdf['distance_km'].notnull()]
+
+    return sites_gdf
+
+def get_snotel(site_code, variable_code='SNOTEL:SNWD_D', start_date='1900-01-01', end_date=datetime.today().strftime('%Y-%m-%d')):
+    
+    wsdlurl = 'https://hydroportal.cuahsi.org/Snotel/cuahsi_1_1.asmx?WSDL'
+    #print(ulmo.cuahsi.wof.get_site_info(wsdlurl, sitecode)['series'].keys())
+
+    #print(sitecode, variablecode, start_date, end_date)
+    values_df = None
+    try:
+        #Request data from the server
+        site_values = ulmo.cuahsi.wof.get_values(wsdlurl, site_code, variable_code, start=start_date, end=end_date)
+        #Convert to a Pandas DataFrame   
+        values_df = pd.DataFrame.from_dict(site_values['values'])
+        #Parse the datetime values to Pandas Timestamp objects
+        values_df['datetime'] = pd.to_datetime(values_df['datetime'], utc=True)
+        #Set the DataFrame index to the Timestamps
+        values_df = values_df.set_index('datetime')
+        #Convert values to float and replace -9999 nodata values with NaN
+        values_df['value'] = pd.to_numeric(values_df['value']).replace(-9999, np.nan)
+        #Remove any records flagged with lower quality
+        values_df = values_df[values_df['quality_control_level_code'] == '1']
+    except:
+        print("Unable to fetch %s" % variable_code)
+
+    return values_df
+
+def get_closest_snotel_data(ts_ds,variable_code='SNOTEL:SNWD_D',distance_cutoff=30,closest=False,start_date='1900-01-01', end_date=datetime.today().strftime('%Y-%m-%d'),sites_df=None):
+    
+    if sites_df is None: # pass the output of find_closest_snotel() to skip refetching the site list
+        sites_df = find_closest_snotel(ts_ds)
+    sites_df = sites_df[sites_df['distance_km']<distance_cutoff]
+    
+    values_dict = {}
+    
+    for site_code in sites_df['code']:
+        new_site = get_snotel(f'SNOTEL:{site_code}', variable_code,start_date=start_date, end_date=end_date)
+        values_dict[site_code] = new_site['value']
+        if closest == True:
+            break
+        
+    site_data_df = pd.DataFrame.from_dict(values_dict)
+    
+    return site_data_df
+
+def cache_snotel(sites_gdf,cache_dir,variable_codes=('SNOTEL:WTEQ_D',),start_date='1900-01-01', end_date=datetime.today().strftime('%Y-%m-%d')):
+    '''
+    Downloads SNOTEL records for every station in sites_gdf into a local cache that sar_snowmelt_timing.validation can read offline.
+    Writes sites.geojson (code, name, elevation_m) and one {code}_{variable}.csv per station and variable. Stations are added to an existing
+    sites.geojson, so a cache can be filled over several calls, and files already in the cache are not fetched again.
+
+            Parameters:
+                    sites_gdf (geopandas GeoDataframe): stations, e.g. find_closest_snotel() output
+                    cache_dir (str): directory to write the cache to
+                    variable_codes (tuple): SNOTEL variables to cache
+                    start_date (str): start of the records 'YYYY-MM-DD'
+                    end_date (str): end of the records 'YYYY-MM-DD'
+
+            Returns:
+                    cache_dir (str): the cache directory
+    '''
+    os.makedirs(cache_dir,exist_ok=True)
+    sites_path = os.path.join(cache_dir,'sites.geojson')
+    cached_sites_gdf = sites_gdf[['code','name','elevation_m','geometry']].to_crs('epsg:4326')
+    if os.path.exists(sites_path): # keep stations cached by earlier calls, e.g. a regional cache filled tile by tile
+        cached_sites_gdf = pd.concat([gpd.read_file(sites_path)[['code','name','elevation_m','geometry']],cached_sites_gdf],ignore_index=True)
+        cached_sites_gdf = cached_sites_gdf.drop_duplicates('code',keep='last')
+    cached_sites_gdf.to_file(sites_path,driver='GeoJSON')
+    for site_code in sites_gdf['code']:
+        for variable_code in variable_codes:
+            path = os.path.join(cache_dir,f"{site_code}_{variable_code.split(':')[-1]}.csv")
+            if os.path.exists(path):
+                continue
+            values_df = get_snotel(f'SNOTEL:{site_code}',variable_code,start_date=start_date,end_date=end_date)
+            if values_df is not None:
+                values_df[['value']].to_csv(path)
+    return cache_dir
+
+def get_s2_ndsi(ts_ds):
+    '''
+    Returns the ndsi time series of the area covered by a given xarray dataset using Sentinel 2 imagery
+
+            Parameters:
+                    ts_ds (xarray dataset): the area we will return the median ndsi over
+
+            Returns:
+                    scenes_ndsi_compute (xarray dataset): computed ndsi time series with same spatial grid and temporal bounds as as the input dataset
+    '''
+    # go from ds to lat lon here
+    ds_4326 = ts_ds.rio.reproject('EPSG:4326', resampling=rio.enums.Resampling.cubic)
+    box = shapely.geometry.box(*ds_4326.rio.bounds())
+    bbox_gdf = gpd.GeoDataFrame(index=[0], crs='epsg:4326', geometry=[box])
+    # must be lat lot bounding box
+    lower_lon, upper_lat, upper_lon, lower_lat = bbox_gdf.bounds.values[0]
+    #lower_lon, upper_lat, upper_lon, lower_lat = gdf.geometry.total_bounds
+
+    lon = (lower_lon + upper_lon)/2
+    lat = (lower_lat + upper_lat)/2
+    
+    start_time = pd.to_datetime(ts_ds.time[0].values).strftime('%Y-%m-%d')
+    end_time = pd.to_datetime(ts_ds.time[-1].values).strftime('%Y-%m-%d')
+    
+    URL = "https://earth-search.aws.element84.com/v0"
+    catalog = pystac_client.Client.open(URL)
+    
+    items = catalog.search(
+    intersects=dict(type="Point", coordinates=[lon, lat]),
+    collections=["sentinel-s2-l2a-cogs"],
+    datetime=f"{start_time}/{end_time}").get_all_items()
+
+    string = f'{ts_ds.rio.crs}'
+    epsg_code = int(string[5:])
+
+    stack = stackstac.stack(items,bounds_latlon=(bbox_gdf.bounds.values[0]),epsg=epsg_code) #epsg=epsg_code
+        
+    if np.unique(stack['proj:epsg']).size>1:
+        stack = stack[stack['proj:epsg']!=stack['epsg']]
+    
+    bounding_box_utm_gf = bbox_gdf.to_crs(stack.crs)
+    xmin, ymax, xmax, ymin = bounding_box_utm_gf.bounds.values[0]
+
+    cloud_cover_threshold = 20
+    lowcloud = stack[stack["eo:cloud_cover"] < cloud_cover_threshold]
+    lowcloud = lowcloud
+    #lowcloud = lowcloud.drop_duplicates("time","first")
+    # snow.groupby(snow.time.dt.date).mean() use this for groupby date
+    vir, swir = lowcloud.sel(band="B03"), lowcloud.sel(band="B11")
+    ndsi = (vir-swir)/(vir+swir)    
+    
+        
+    time_slice = slice(start_time,end_time)
+    scenes_ndsi = ndsi.sel(x=slice(xmin,xmax),y=slice(ymin,ymax)).sel(time=time_slice)
+    scenes_ndsi = scenes_ndsi.rio.write_crs(stack.rio.crs)
+    
+    
+    scenes_ndsi_compute = scenes_ndsi.rio.reproject_match(ts_ds).resample(time='1D',skipna=True).mean("time", keep_attrs=True).dropna('time',how='all')#.compute() #what was this for again?????
+    #scenes_ndsi_compute = scenes_ndsi_compute.where(ts_ds.isel(time=0)>0)
+    return scenes_ndsi_compute
+
+def get_s2_ndwi(ts_ds):
+    '''
+    Returns the ndsi time series of the area covered by a given xarray dataset using Sentinel 2 imagery
+
+            Parameters:
+                    ts_ds (xarray dataset): the area we will return the median ndsi over
+
+            Returns:
+                    scenes_ndsi_compute (xarray dataset): computed ndsi time series with same spatial grid and temporal bounds as as the input dataset
+    '''
+    # go from ds to lat lon here
+    ds_4326 = ts_ds.rio.reproject('EPSG:4326', resampling=rio.enums.Resampling.cubic)
+    box = shapely.geometry.box(*ds_4326.rio.bounds())
+    bbox_gdf = gpd.GeoDataFrame(index=[0], crs='epsg:4326', geometry=[box])
+    # must be lat lot bounding box
+    lower_lon, upper_lat, upper_lon, lower_lat = bbox_gdf.bounds.values[0]
+    #lower_lon, upper_lat, upper_lon, lower_lat = gdf.geometry.total_bounds
+
+    lon = (lower_lon + upper_lon)/2
+    lat = (lower_lat + upper_lat)/2
+    
+    start_time = pd.to_datetime(ts_ds.time[0].values).strftime('%Y-%m-%d')
+    end_time = pd.to_datetime(ts_ds.time[-1].values).strftime('%Y-%m-%d')
+    
+    URL = "https://earth-search.aws.element84.com/v0"
+    catalog = pystac_client.Client.open(URL)
+    
+    items = catalog.search(
+    intersects=dict(type="Point", coordinates=[lon, lat]),
+    collections=["sentinel-s2-l2a-cogs"],
+    datetime=f"{start_time}/{end_time}").get_all_items()
+
+    string = f'{ts_ds.rio.crs}'
+    epsg_code = int(string[5:])
+
+    stack = stackstac.stack(items,bounds_latlon=(bbox_gdf.bounds.values[0]),epsg=epsg_code) #epsg=epsg_code
+        
+    if np.unique(stack['proj:epsg']).size>1:
+        stack = stack[stack['proj:epsg']!=stack['epsg']]
+    
+    bounding_box_utm_gf = bbox_gdf.to_crs(stack.crs)
+    xmin, ymax, xmax, ymin = bounding_box_utm_gf.bounds.values[0]
+
+    cloud_cover_threshold = 20
+    lowcloud = stack[stack["eo:cloud_cover"] < cloud_cover_threshold]
+    lowcloud = lowcloud
+    #lowcloud = lowcloud.drop_duplicates("time","first")
+    # snow.groupby(snow.time.dt.date).mean() use this for groupby date
+    vir, swir = lowcloud.sel(band="B08"), lowcloud.sel(band="B12")
+    ndwi = (vir-swir)/(vir+swir)    
+    
+        
+    time_slice = slice(start_time,end_time)
+    scenes_ndwi = ndwi.sel(x=slice(xmin,xmax),y=slice(ymin,ymax)).sel(time=time_slice)
+    scenes_ndwi = scenes_ndwi.rio.write_crs(stack.rio.crs)
+    
+    
+    scenes_ndwi_compute = scenes_ndwi.rio.reproject_match(ts_ds).resample(time='1D',skipna=True).mean("time", keep_attrs=True).dropna('time',how='all')#.compute() #what was this for again?????
+    #scenes_ndsi_compute = scenes_ndsi_compute.where(ts_ds.isel(time=0)>0)
+    return scenes_ndwi_compute
+
+def get_s2_rgb(ts_ds):
+    '''
+    Returns the rgb time series of the area covered by a given xarray dataset using Sentinel 2 imagery
+
+            Parameters:
+                    ts_ds (xarray dataset): the area we will return the rgb over
+
+            Returns:
+                    scenes_rgb_compute (xarray dataset): computed rgb time series with same spatial grid and temporal bounds as as the input dataset
+    '''
+    # go from ds to lat lon here
+    ds_4326 = ts_ds.rio.reproject('EPSG:4326', resampling=rio.enums.Resampling.cubic)
+    box = shapely.geometry.box(*ds_4326.rio.bounds())
+    bbox_gdf = gpd.GeoDataFrame(index=[0], crs='epsg:4326', geometry=[box])
+    # must be lat lot bounding box
+    lower_lon, upper_lat, upper_lon, lower_lat = bbox_gdf.bounds.values[0]
+    #lower_lon, upper_lat, upper_lon, lower_lat = gdf.geometry.total_bounds
+
+    lon = (lower_lon + upper_lon)/2
+    lat = (lower_lat + upper_lat)/2
+    
+    start_time = pd.to_datetime(ts_ds.time[0].values).strftime('%Y-%m-%d')
+    end_time = pd.to_datetime(ts_ds.time[-1].values).strftime('%Y-%m-%d')
+    
+    URL = "https://earth-search.aws.element84.com/v0"
+    catalog = pystac_client.Client.open(URL)
+    
+    items = catalog.search(
+    intersects=dict(type="Point", coordinates=[lon, lat]),
+    collections=["sentinel-s2-l2a-cogs"],
+    datetime=f"{start_time}/{end_time}").get_all_items()
+    
+    string = f'{ts_ds.rio.crs}'
+    epsg_code = int(string[5:])
+    
+    stack = stackstac.stack(items,bounds_latlon=(bbox_gdf.bounds.values[0]),epsg=epsg_code) #epsg=epsg_code
+    
+    if np.unique(stack['proj:epsg']).size>1:
+        stack = stack[stack['proj:epsg']!=stack['epsg']]
+    
+    
+    bounding_box_utm_gf = bbox_gdf.to_crs(stack.crs)
+    xmin, ymax, xmax, ymin = bounding_box_utm_gf.bounds.values[0]
+
+    cloud_cover_threshold = 20
+    lowcloud = stack[stack["eo:cloud_cover"] < cloud_cover_threshold]
+    lowcloud = lowcloud
+    #lowcloud = lowcloud.drop_duplicates("time","first")
+    # snow.groupby(snow.time.dt.date).mean() use this for groupby date
+    rgb = lowcloud.sel(band=["B04","B03","B02"])
+    
+    time_slice = slice(start_time,end_time)
+    scenes_rgb = rgb.sel(x=slice(xmin,xmax),y=slice(ymin,ymax)).sel(time=time_slice)
+    scenes_rgb = scenes_rgb.rio.write_crs(stack.rio.crs)
+    scenes_rgb_compute = scenes_rgb.resample(time='1D',skipna=True).mean("time", keep_attrs=True).dropna('time',how='all')#.compute()
+    
+    # epsg problems?
+    
+    return scenes_rgb_compute
+
+
+class AOIContext:
+    '''
+    Bundle of the products drawn by the plotting functions for one area of interest. Each product is computed on first access and memoized,
+    so passing the same context to several figure functions costs one fetch / compute per product instead of one per figure.
+
+            Parameters:
+                    ts_ds (xarray dataset): Sentinel-1 backscatter stack of the area of interest
+                    distance_cutoff (float): only SNOTEL stations closer than this [km] are used
+                    start_date (str): start of the SNOTEL records 'YYYY-MM-DD'
+                    end_date (str): end of the SNOTEL records 'YYYY-MM-DD'
+
+            Attributes (lazy):
+                    orbit_means (dict): relative orbit -> (direction, AOI-mean backscatter time series)
+                    ndsi (xarray dataset): Sentinel-2 NDSI time series, see get_s2_ndsi()
+                    ndsi_mean (xarray dataset): AOI-mean NDSI time series
+                    snotel_sites (geopandas GeoDataFrame): SNOTEL stations sorted by distance, see find_closest_snotel()
+                    closest_snotel (geopandas GeoDataFrame): the closest station
+                    runoff_onset (xarray dataset): runoff onset dates, see get_runoff_onset()
+    '''
+    def __init__(self,ts_ds,distance_cutoff=30,start_date='1900-01-01',end_date=datetime.today().strftime('%Y-%m-%d')):
+        self.ts_ds = ts_ds
+        self.distance_cutoff = distance_cutoff
+        self.start_date = start_date
+        self.end_date = end_date
+        self._snotel = {}
+
+    @cached_property
+    def orbit_means(self):
+        orbit_means = {}
+        for orbit in np.unique(self.ts_ds.coords['sat:relative_orbit']):
+            orbit_ds = self.ts_ds[self.ts_ds.coords['sat:relative_orbit']==orbit]
+            direction = orbit_ds['sat:orbit_state'].values[0].capitalize()
+            orbit_means[orbit] = (direction, dequantize_backscatter(orbit_ds).mean(dim=['x','y']).compute())
+        return orbit_means
+
+    @cached_property
+    def ndsi(self):
+        return get_s2_ndsi(self.ts_ds)
+
+    @cached_property
+    def ndsi_mean(self):
+        return self.ndsi.mean(dim=['x','y']).compute()
+
+    @cached_property
+    def snotel_sites(self):
+        return find_closest_snotel(self.ts_ds)
+
+    @cached_property
+    def closest_snotel(self):
+        return self.snotel_sites[self.snotel_sites['distance_km']==self.snotel_sites['distance_km'].min()]
+
+    @cached_property
+    def runoff_onset(self):
+        return get_runoff_onset(self.ts_ds).compute()
+
+    def snotel(self,variable_code='SNOTEL:SNWD_D'):
+        '''
+        Returns the closest station's series for variable_code, fetched once per variable (see get_closest_snotel_data()).
+
+                Parameters:
+                        variable_code (str): SNOTEL variable, e.g. SNOTEL:SNWD_D, SNOTEL:WTEQ_D, SNOTEL:PRCPSA_D, SNOTEL:TAVG_D
+
+                Returns:
+                        site_data_df (pandas DataFrame): daily values of the closest station
+        '''
+        if variable_code not in self._snotel:
+            self._snotel[variable_code] = get_closest_snotel_data(self.ts_ds,variable_code=variable_code,distance_cutoff=self.distance_cutoff,closest=True,start_date=self.start_date,end_date=self.end_date,sites_df=self.snotel_sites)
+        return self._snotel[variable_code]
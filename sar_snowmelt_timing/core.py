@@ -0,0 +1,853 @@
+"""Core computation functions for Sentinel-1 C-band SAR backscatter stacks (RTC product from https://registry.opendata.aws/sentinel-1-rtc-indigo/).
+
+Only numpy, pandas and xarray are imported at module load so process-pool workers and short-lived containers that just need
+e.g. get_runoff_onset() start quickly. STAC / scipy / geopandas are imported inside the functions that need them.
+Plotting lives in sar_snowmelt_timing.plotting and ancillary data (DEM, SNOTEL, Sentinel-2) in sar_snowmelt_timing.ancillary.
+
+Author: Eric Gagliano (egagli@uw.edu)
+Updated: 10/2026
+"""
+
+import os
+import math
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+# int16 storage for dB backscatter: value = count*DB_SCALE_FACTOR + DB_ADD_OFFSET
+DB_SCALE_FACTOR = 0.01
+DB_ADD_OFFSET = 0.0
+DB_NODATA = -32768
+
+def get_s1_rtc_stac(bbox_gdf,start_time='2015-01-01',end_time=datetime.today().strftime('%Y-%m-%d'),orbit_direction='all',polarization='gamma0_vv',collection='mycollection.json',units='linear',quantize=None,merge_frames=False):
+    '''
+    Returns a Sentinel-1 SAR backscatter xarray dataset using STAC data from Indigo over the given time and bounding box.
+
+            Parameters:
+                    bbox_gdf (geopandas GeoDataframe): geodataframe bounding box
+                    start_time (str): start time of returned data 'YYYY-MM-DD'
+                    end_time (str): end time of returned data 'YYYY-MM-DD'
+                    orbit_direction (str): orbit direction of S1--can be all, ascending, or decending
+                    polarization (str): SAR polarization, use gamma0_vv
+                    collection (str): points to json collection, will be different for each MGRS square
+                    units (str): units of returned backscatter--can be linear (power, default) or dB
+                    quantize (str): optional compact storage dtype--None (float32, default), int16 or float16. see quantize_backscatter()
+                    merge_frames (bool): mosaic adjacent frames of the same pass into one time slice, see merge_same_pass()
+
+            Returns:
+                    scenes (xarray dataset): xarray stack of all scenes in the specified spatio-temporal window
+    '''
+    if units not in ('linear','dB'):
+        raise ValueError(f'units must be linear or dB, got {units}')
+    if quantize == 'int16' and units != 'dB':
+        raise ValueError("int16 quantization uses a dB step, request units='dB' (or quantize='float16' for linear)")
+
+    # imported here so that core stays cheap to import for workers that never load STAC
+    import pystac
+    import stackstac
+
+    # GDAL environment variables for better performance
+    os.environ['AWS_REGION']='us-west-2'
+    os.environ['GDAL_DISABLE_READDIR_ON_OPEN']='EMPTY_DIR' 
+    os.environ['AWS_NO_SIGN_REQUEST']='YES'
+    
+    # Load STAC ItemCollection
+    stac_items = pystac.ItemCollection.from_file(collection)
+    items = [item.to_dict(transform_hrefs=False) for item in stac_items]
+
+    stack = stackstac.stack(items,dtype='float32')
+    
+    bounding_box_utm_gf = bbox_gdf.to_crs(stack.crs)
+    xmin, ymax, xmax, ymin = bounding_box_utm_gf.bounds.values[0]
+    time_slice = slice(start_time,end_time)
+    
+    scenes = stack.sel(band=polarization).sel(x=slice(xmin,xmax),y=slice(ymin,ymax)).sel(time=time_slice)
+    
+    if orbit_direction == 'all':
+        scenes = scenes
+    else:
+        scenes = scenes.where(scenes.coords['sat:orbit_state']==orbit_direction,drop=True)
+    
+    if merge_frames:
+        scenes = merge_same_pass(scenes)
+    if units == 'dB':
+        scenes = backscatter_to_db(scenes)
+    if quantize is not None:
+        scenes = quantize_backscatter(scenes,dtype=quantize)
+    return scenes
+
+
+def backscatter_to_db(ts_ds):
+    '''
+    Converts linear power backscatter to dB. Non-positive values (no return) become NaN instead of -inf.
+
+            Parameters:
+                    ts_ds (xarray dataset): linear power backscatter
+
+            Returns:
+                    ts_ds_db (xarray dataset): backscatter in dB, float32
+    '''
+    ts_ds_db = (10*np.log10(ts_ds.where(ts_ds>0))).astype('float32')
+    ts_ds_db.attrs = dict(ts_ds.attrs)
+    ts_ds_db.attrs['units'] = 'dB'
+    return ts_ds_db
+
+
+def quantize_backscatter(ts_ds,dtype='int16',scale_factor=DB_SCALE_FACTOR,add_offset=DB_ADD_OFFSET,nodata=DB_NODATA):
+    '''
+    Returns a compact copy of a backscatter stack for caching and computation. For int16, values are stored as round((value-add_offset)/scale_factor)
+    with NaN mapped to the nodata sentinel, and the CF attributes scale_factor, add_offset and _FillValue are recorded so the cube decodes
+    correctly when written to and read back from netCDF / GeoTIFF. The default scale of 0.01 dB covers +-327 dB, so int16 requires dB input
+    (attrs['units'] == 'dB', see backscatter_to_db()): linear power would collapse to a few dozen levels.
+    float16 keeps NaN as is and needs no attributes. Either halves the memory and disk of a float32 stack.
+
+            Parameters:
+                    ts_ds (xarray dataset): backscatter stack, ideally in dB (see backscatter_to_db())
+                    dtype (str): int16 or float16
+                    scale_factor (float): int16 quantization step
+                    add_offset (float): int16 quantization offset
+                    nodata (int): int16 sentinel written where ts_ds is NaN
+
+            Returns:
+                    ts_ds_quantized (xarray dataset): quantized backscatter stack
+    '''
+    attrs = dict(ts_ds.attrs)
+    if dtype == 'float16':
+        ts_ds_quantized = ts_ds.astype('float16')
+    elif dtype == 'int16':
+        if attrs.get('units') != 'dB':
+            raise ValueError('int16 quantization requires dB backscatter, convert with backscatter_to_db() first')
+        info = np.iinfo('int16')
+        counts = ((ts_ds-add_offset)/scale_factor).round().clip(info.min+1,info.max)
+        ts_ds_quantized = counts.fillna(nodata).astype('int16')
+        attrs.update({'scale_factor':scale_factor,'add_offset':add_offset,'_FillValue':nodata})
+    else:
+        raise ValueError(f'quantize dtype must be int16 or float16, got {dtype}')
+    ts_ds_quantized.attrs = attrs
+    return ts_ds_quantized
+
+
+def dequantize_backscatter(ts_ds):
+    '''
+    Decodes a stack produced by quantize_backscatter() back to float32 with NaN for nodata. Float stacks are returned unchanged (float16 is upcast to float32).
+    Lazy if ts_ds is dask-backed, so only the chunks being reduced are ever held as float.
+
+            Parameters:
+                    ts_ds (xarray dataset): backscatter stack
+
+            Returns:
+                    ts_ds_decoded (xarray dataset): float32 backscatter stack
+    '''
+    if not np.issubdtype(ts_ds.dtype,np.integer):
+        if ts_ds.dtype == np.float16:
+            return ts_ds.astype('float32')
+        return ts_ds
+    attrs = dict(ts_ds.attrs)
+    scale_factor = attrs.pop('scale_factor',1.0)
+    add_offset = attrs.pop('add_offset',0.0)
+    nodata = attrs.pop('_FillValue',DB_NODATA)
+    ts_ds_decoded = (ts_ds.where(ts_ds!=nodata)*scale_factor+add_offset).astype('float32')
+    ts_ds_decoded.attrs = attrs
+    return ts_ds_decoded
+
+
+def _valid_mask(ts_ds):
+    # True where ts_ds holds data, for both NaN (float) and sentinel (int16) nodata
+    if np.issubdtype(ts_ds.dtype,np.integer):
+        return ts_ds != ts_ds.attrs.get('_FillValue',DB_NODATA)
+    return ts_ds.notnull()
+
+
+def _fill_nodata_high(ts_ds):
+    # replace nodata with a value above any backscatter so argmin never picks it, without changing the dtype
+    if np.issubdtype(ts_ds.dtype,np.integer):
+        high = np.iinfo(ts_ds.dtype).max
+    else:
+        high = 9999
+    return ts_ds.where(_valid_mask(ts_ds),ts_ds.dtype.type(high))
+
+
+def _backscatter_label(ts_ds):
+    if ts_ds.attrs.get('units') == 'dB':
+        return 'Backscatter [dB]'
+    return 'Backscatter [Watts]'
+
+#def get_runoff_onset(ts_ds):
+#    mins_info_runoff = ts_ds.argmin(dim='time',skipna=False)
+#    runoff_dates = ts_ds[mins_info_runoff].time
+#    return runoff_dates
+
+def get_runoff_onset(ts_ds):
+    # works on linear, dB and quantized (int16/float16) stacks without upcasting
+    valid = _valid_mask(ts_ds.isel(time=0))
+    ts_ds = _fill_nodata_high(ts_ds)
+    mins_info_runoff = ts_ds.argmin(dim='time',skipna=True)
+    runoff_dates = ts_ds[mins_info_runoff].time
+    runoff_dates = runoff_dates.where(valid)
+    return runoff_dates
+
+def get_ripening_onset(ts_ds,orbit='ascending'): # fix this
+    # 1-D time mask keeps the dtype (where(drop=True) would upcast int16) and handles a scalar sat:orbit_state (single-orbit collections)
+    orbit_mask = (ts_ds.coords['sat:orbit_state']==orbit).broadcast_like(ts_ds.time)
+    ts_ds = ts_ds.isel(time=orbit_mask.values)
+    valid = _valid_mask(ts_ds.isel(time=0))
+    ts_ds = _fill_nodata_high(ts_ds)
+    mins_info_ripening = ts_ds.differentiate(coord='time',datetime_unit='W').argmin(dim='time',skipna=False) # dt=week
+    ripening_dates = ts_ds[mins_info_ripening].time
+    ripening_dates = ripening_dates.where(valid)
+    return ripening_dates
+
+def get_stats(ts_ds,dem=None,aspect=None,slope=None,dah=None):
+    import scipy.linalg
+    import geopandas as gpd
+    import rioxarray
+    if dem is None or aspect is None or slope is None or dah is None:
+        from .ancillary import get_py3dep_dem, get_py3dep_aspect, get_py3dep_slope, get_dah
+
+    runoff_dates = get_runoff_onset(ts_ds)
+    
+    if all(np.array(ts_ds.coords['sat:orbit_state']=='descending')):
+        ripening_dates = get_ripening_onset(ts_ds,orbit='descending')
+    else:
+        ripening_dates = get_ripening_onset(ts_ds)
+        
+    if dem is None:
+        dem_projected = get_py3dep_dem(ts_ds)
+    else:
+        dem_projected = dem
+    if aspect is None:
+        aspect_projected = get_py3dep_aspect(ts_ds)
+    else:
+        aspect_projected = aspect
+    if slope is None:
+        slope_projected = get_py3dep_slope(ts_ds)
+    else:
+        slope_projected = slope
+    if dah is None:
+        dah_projected = get_dah(ts_ds)
+    else: 
+        dah_projected = dah
+        
+    dates_df = pd.DataFrame(columns=['x','y','elevation','aspect','slope','dah','runoff_dates','ripening_dates'])
+    a1, a2 = np.meshgrid(dem_projected.indexes['x'],dem_projected.indexes['y'])
+    dates_df['x'] = a1.reshape(-1)
+    dates_df['y'] = a2.reshape(-1)
+    dates_df['elevation'] = dem_projected.data.reshape(-1)
+    dates_df['aspect'] = aspect_projected.data.reshape(-1)
+    dates_df['slope'] = slope_projected.data.reshape(-1)
+    dates_df['dah'] = dah_projected.data.reshape(-1)
+    dates_df['runoff_dates'] = runoff_dates.dt.dayofyear.data.reshape(-1)
+    dates_df['ripening_dates'] = ripening_dates.dt.dayofyear.data.reshape(-1)
+    dates_df = dates_df.dropna()
+    
+    dates_mls_df = dates_df.filter(['elevation','dah','runoff_dates','ripening_dates'])
+    
+    predictors = np.append(np.ones_like([dates_df['runoff_dates']]).T,dates_mls_df.iloc[:,[0,1]].to_numpy(),axis=1)
+    B,_,_,_ = scipy.linalg.lstsq(predictors, dates_mls_df.iloc[:,2])
+    dates_df['runoff_prediction'] = predictors.dot(B)
+    
+    predictors = np.append(np.ones_like([dates_df['runoff_dates']]).T,dates_mls_df.iloc[:,[0,1]].to_numpy(),axis=1)
+    B,_,_,_ = scipy.linalg.lstsq(predictors, dates_mls_df.iloc[:,3])
+    dates_df['ripening_prediction'] = predictors.dot(B)
+    
+    dates_gdf = gpd.GeoDataFrame(dates_df,geometry=gpd.points_from_xy(dates_df['x'],dates_df['y'],crs=ts_ds.rio.crs))
+    dates_gdf=dates_gdf.set_index(['y','x'])
+    
+    return dates_gdf
+
+
+
+class DOYClimatology:
+    '''
+    Streaming day-of-year climatology of backscatter: mean, variance and count for each day-of-year window, per pixel or per bin
+    (e.g. elevation band). Updates use Welford / Chan parallel merging, so stacks can be fed one year (or one chunk of time) at a time
+    and the full multi-year cube is never held at once. Memory is O(doy windows x pixels) (or x bins).
+
+            Parameters:
+                    window (int): width of each day-of-year window [days]
+                    bins (xarray dataset): optional (y,x) labels on the backscatter grid, e.g. (dem//100)*100 for 100 m elevation bands.
+                                           pixels sharing a label are pooled, NaN labels are excluded. None for per-pixel statistics
+
+            Attributes:
+                    count (numpy array): valid samples per (doy window, pixel or bin)
+                    mean (numpy array): running mean per (doy window, pixel or bin)
+                    m2 (numpy array): running sum of squared deviations per (doy window, pixel or bin)
+    '''
+    def __init__(self,window=12,bins=None):
+        self.window = window
+        self.bins = bins
+        self.n_windows = math.ceil(366/window)
+        self.y = None
+        self.x = None
+        self.count = None
+        self.mean = None
+        self.m2 = None
+        if bins is not None:
+            self.labels = np.unique(bins.values[~np.isnan(bins.values)])
+
+    def _group_index(self,ts_ds):
+        # flat (y*x,) index of the pixel or bin each pixel accumulates into, -1 for excluded pixels
+        if self.bins is None:
+            return np.arange(ts_ds.sizes['y']*ts_ds.sizes['x'])
+        bins = self.bins.transpose('y','x').values.reshape(-1)
+        index = np.searchsorted(self.labels,bins)
+        index[np.isnan(bins)] = -1
+        return index
+
+    def _init_state(self,ts_ds):
+        self.y = ts_ds['y'].values
+        self.x = ts_ds['x'].values
+        n_groups = self.y.size*self.x.size if self.bins is None else self.labels.size
+        self.count = np.zeros((self.n_windows,n_groups),dtype='int64')
+        self.mean = np.zeros((self.n_windows,n_groups),dtype='float64')
+        self.m2 = np.zeros((self.n_windows,n_groups),dtype='float64')
+
+    def _merge_into(self,window_index,count_b,mean_b,m2_b):
+        # Chan et al. parallel update of (count, mean, m2) for one doy window
+        count_a, mean_a = self.count[window_index], self.mean[window_index]
+        count = count_a+count_b
+        with np.errstate(invalid='ignore',divide='ignore'):
+            delta = mean_b-mean_a
+            self.mean[window_index] = np.where(count>0,mean_a+delta*count_b/count,0)
+            self.m2[window_index] = np.where(count>0,self.m2[window_index]+m2_b+delta**2*count_a*count_b/count,0)
+        self.count[window_index] = count
+
+    def window_of(self,time):
+        '''Returns the doy window index of each timestamp in time (xarray time coordinate).'''
+        return (time.dt.dayofyear.values-1)//self.window
+
+    def update(self,ts_ds):
+        '''
+        Merges a backscatter stack (any time span, linear, dB or quantized) into the climatology. Only ts_ds is loaded, so feed
+        long records a year at a time (see aggregate_by_doy()).
+
+                Parameters:
+                        ts_ds (xarray dataset): backscatter stack on the same grid as previous updates
+
+                Returns:
+                        self (DOYClimatology): the updated climatology
+        '''
+        ts_ds = dequantize_backscatter(ts_ds).transpose('time','y','x')
+        if self.count is None:
+            self._init_state(ts_ds)
+        group = self._group_index(ts_ds)
+        n_groups = self.count.shape[1]
+        values = ts_ds.values.reshape(ts_ds.sizes['time'],-1)
+        windows = self.window_of(ts_ds.time)
+        for window_index in np.unique(windows):
+            samples = values[windows==window_index]
+            labels = np.broadcast_to(group,samples.shape)
+            valid = ~np.isnan(samples) & (labels>=0)
+            samples, labels = samples[valid], labels[valid]
+            count_b = np.bincount(labels,minlength=n_groups)
+            with np.errstate(invalid='ignore',divide='ignore'):
+                mean_b = np.bincount(labels,weights=samples,minlength=n_groups)/count_b
+            m2_b = np.bincount(labels,weights=(samples-mean_b[labels])**2,minlength=n_groups)
+            self._merge_into(window_index,count_b,np.nan_to_num(mean_b),m2_b)
+        return self
+
+    def merge(self,other):
+        '''
+        Merges another climatology built with the same window, grid and bins (e.g. computed for other years in another process).
+
+                Parameters:
+                        other (DOYClimatology): climatology to merge in
+
+                Returns:
+                        self (DOYClimatology): the updated climatology
+        '''
+        if other.count is None:
+            return self
+        if self.count is None:
+            self.y, self.x = other.y, other.x
+            self.count, self.mean, self.m2 = other.count.copy(), other.mean.copy(), other.m2.copy()
+            return self
+        if other.window != self.window or other.count.shape != self.count.shape:
+            raise ValueError('can only merge climatologies with the same window and grid / bins')
+        for window_index in range(self.n_windows):
+            self._merge_into(window_index,other.count[window_index],other.mean[window_index],other.m2[window_index])
+        return self
+
+    def _unflatten(self,array):
+        if self.bins is None:
+            return array.reshape(self.n_windows,self.y.size,self.x.size)
+        return array
+
+    def to_dataset(self):
+        '''
+        Returns the climatology as an xarray Dataset with mean, variance (sample, NaN below two samples) and count. Windows are
+        labeled by their first day of year. Can be saved with to_netcdf() and restored with DOYClimatology.from_dataset().
+
+                Returns:
+                        climatology_ds (xarray Dataset): per-window statistics, dims (doy,y,x) or (doy,bin)
+        '''
+        doy = np.arange(self.n_windows)*self.window+1
+        if self.bins is None:
+            dims = ('doy','y','x')
+            coords = {'doy':doy,'y':self.y,'x':self.x}
+        else:
+            dims = ('doy','bin')
+            coords = {'doy':doy,'bin':self.labels}
+        with np.errstate(invalid='ignore',divide='ignore'):
+            mean = np.where(self.count>0,self.mean,np.nan)
+            variance = np.where(self.count>1,self.m2/(self.count-1),np.nan)
+        climatology_ds = xr.Dataset({'mean':(dims,self._unflatten(mean)),
+                                     'variance':(dims,self._unflatten(variance)),
+                                     'count':(dims,self._unflatten(self.count))},coords=coords)
+        climatology_ds.attrs['window'] = self.window
+        return climatology_ds
+
+    @classmethod
+    def from_dataset(cls,climatology_ds,bins=None):
+        '''
+        Restores a climatology saved with to_dataset() so that new years can be merged in.
+
+                Parameters:
+                        climatology_ds (xarray Dataset): output of to_dataset()
+                        bins (xarray dataset): the bins the climatology was built with, None for per-pixel
+
+                Returns:
+                        climatology (DOYClimatology): restored climatology
+        '''
+        climatology = cls(window=int(climatology_ds.attrs['window']),bins=bins)
+        climatology.y = climatology_ds['y'].values if bins is None else None
+        climatology.x = climatology_ds['x'].values if bins is None else None
+        n_windows = climatology.n_windows
+        climatology.count = climatology_ds['count'].values.reshape(n_windows,-1).astype('int64')
+        climatology.mean = np.nan_to_num(climatology_ds['mean'].values.reshape(n_windows,-1))
+        climatology.m2 = np.nan_to_num(climatology_ds['variance'].values.reshape(n_windows,-1))*np.maximum(climatology.count-1,0)
+        return climatology
+
+    def anomaly(self,ts_ds,standardize=True):
+        '''
+        Returns the anomaly of a backscatter stack against the climatology of each acquisition's doy window, e.g. this season's melt
+        against the multi-year baseline.
+
+                Parameters:
+                        ts_ds (xarray dataset): backscatter stack on the climatology grid, same units as the climatology
+                        standardize (bool): divide by the climatological standard deviation (z-score)
+
+                Returns:
+                        anomaly_ds (xarray dataset): anomaly with the same dims as ts_ds
+        '''
+        climatology_ds = self.to_dataset()
+        windows = xr.DataArray(self.window_of(ts_ds.time),dims='time',coords={'time':ts_ds.time})
+        if self.bins is None:
+            mean = climatology_ds['mean'].isel(doy=windows).drop_vars(['doy','y','x'])
+            std = np.sqrt(climatology_ds['variance'].isel(doy=windows)).drop_vars(['doy','y','x'])
+        else:
+            bin_index = xr.DataArray(self._group_index(ts_ds).reshape(ts_ds.sizes['y'],ts_ds.sizes['x']),dims=('y','x'))
+            mean = climatology_ds['mean'].isel(doy=windows,bin=bin_index.clip(0)).where(bin_index>=0).drop_vars(['doy','bin'])
+            std = np.sqrt(climatology_ds['variance'].isel(doy=windows,bin=bin_index.clip(0))).where(bin_index>=0).drop_vars(['doy','bin'])
+        anomaly_ds = dequantize_backscatter(ts_ds)-mean
+        if standardize:
+            anomaly_ds = anomaly_ds/std
+        return anomaly_ds
+
+
+def aggregate_by_doy(ts_ds,window=12,bins=None,climatology=None):
+    '''
+    Returns the multi-year day-of-year climatology (mean, variance, count per doy window) of a backscatter stack, e.g. the 2015-present
+    output of get_s1_rtc_stac(). The stack is loaded one calendar year at a time and folded into a streaming accumulator, so memory
+    stays O(doy windows x pixels) however long the record is.
+
+            Parameters:
+                    ts_ds (xarray dataset): backscatter stack (linear, dB or quantized)
+                    window (int): width of each day-of-year window [days]
+                    bins (xarray dataset): optional (y,x) labels to pool pixels by, e.g. elevation bands. None for per-pixel statistics
+                    climatology (DOYClimatology): existing climatology to merge new years into, window and bins are then taken from it
+
+            Returns:
+                    climatology (DOYClimatology): the climatology, see DOYClimatology.to_dataset() and DOYClimatology.anomaly()
+    '''
+    if climatology is None:
+        climatology = DOYClimatology(window=window,bins=bins)
+    for year in np.unique(ts_ds.time.dt.year):
+        climatology.update(ts_ds.sel(time=str(year)))
+    return climatology
+
+
+def _band_quantiles(band,values,quantiles):
+    # per-band quantiles (numpy 'linear' method) from a single lexsort of all pixels instead of one sort per band
+    order = np.lexsort((values,band))
+    band, values = band[order], values[order]
+    bands, starts, counts = np.unique(band,return_index=True,return_counts=True)
+    position = starts[:,None]+np.asarray(quantiles)[None,:]*(counts[:,None]-1)
+    lower = np.floor(position).astype('int64')
+    upper = np.ceil(position).astype('int64')
+    quantile_values = values[lower]+(values[upper]-values[lower])*(position-lower)
+    return bands, counts, quantile_values
+
+
+def melt_onset_elevation_line(runoff_onsets,dems,bin_size=100,quantiles=(0.1,0.5,0.9)):
+    '''
+    Returns the elevation vs. melt-day curve for each year and each area of interest: quantiles of runoff onset day of year within
+    each elevation band. Each raster is flattened and sorted once, so many years x AOIs can be compared in one compact table
+    instead of building a per-pixel GeoDataFrame with get_stats() for each.
+
+            Parameters:
+                    runoff_onsets (dict): {(aoi, year): runoff onset raster}, rasters are get_runoff_onset() output (dates) or day of year
+                    dems (dict or xarray dataset): {aoi: dem} or a single dem used for all AOIs. reprojected to each onset grid if needed
+                    bin_size (float): elevation band width [m]
+                    quantiles (tuple): onset quantiles to report for each band
+
+            Returns:
+                    elevation_line_df (pandas DataFrame): one row per (aoi, year, band) with the band center elevation, pixel count and
+                                                          one column per quantile (p10, p50, p90 by default)
+    '''
+    quantile_columns = [f'p{q*100:g}' for q in quantiles]
+    frames = []
+    for (aoi, year), onset in runoff_onsets.items():
+        dem = dems[aoi] if isinstance(dems,dict) else dems
+        dem = dem.squeeze()
+        if dem.shape != onset.shape:
+            import rioxarray
+            dem = dem.rio.reproject_match(onset)
+        if np.issubdtype(onset.dtype,np.datetime64):
+            onset = onset.dt.dayofyear
+        onset_doy = np.asarray(onset.values,dtype='float64').reshape(-1)
+        elevation = np.asarray(dem.values,dtype='float64').reshape(-1)
+        valid = ~np.isnan(onset_doy) & ~np.isnan(elevation)
+        if not valid.any():
+            continue
+        band = np.floor(elevation[valid]/bin_size).astype('int64')
+        bands, counts, quantile_values = _band_quantiles(band,onset_doy[valid],quantiles)
+        frame = pd.DataFrame(quantile_values,columns=quantile_columns)
+        frame.insert(0,'aoi',aoi)
+        frame.insert(1,'year',year)
+        frame.insert(2,'elevation',bands*bin_size+bin_size/2)
+        frame.insert(3,'count',counts)
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=['aoi','year','elevation','count']+quantile_columns)
+    elevation_line_df = pd.concat(frames,ignore_index=True)
+    return elevation_line_df
+
+
+def _stack_crs(ts_ds):
+    # stackstac keeps the crs in attrs (and an epsg coordinate that survives reductions), fall back to rioxarray for other grids
+    if 'crs' in ts_ds.attrs:
+        return ts_ds.attrs['crs']
+    if 'epsg' in ts_ds.coords and ts_ds.coords['epsg'].size == 1:
+        return f"epsg:{int(ts_ds.coords['epsg'])}"
+    import rioxarray
+    return ts_ds.rio.crs
+
+
+def _nearest_pixels(ts_ds,xs,ys):
+    # vectorized (y index, x index, inside) of the pixel nearest each (x, y), inside is False beyond half a pixel from the grid
+    x = ts_ds['x'].values
+    y = ts_ds['y'].values
+    def nearest(coords,values):
+        order = np.argsort(coords)
+        position = np.clip(np.searchsorted(coords[order],values),1,coords.size-1)
+        left, right = order[position-1], order[position]
+        index = np.where(np.abs(values-coords[left])<=np.abs(values-coords[right]),left,right)
+        return index, np.abs(values-coords[index]) <= np.abs(coords[1]-coords[0])/2
+    iy, inside_y = nearest(y,np.asarray(ys,dtype='float64'))
+    ix, inside_x = nearest(x,np.asarray(xs,dtype='float64'))
+    return iy, ix, inside_y & inside_x
+
+
+def _geometry_pixels(ts_ds,geometries):
+    # (sample -> geometry, y index, x index) for the pixels whose centers fall in each geometry, or the nearest pixel for points
+    import geopandas as gpd
+    x = ts_ds['x'].values
+    y = ts_ds['y'].values
+    is_point = np.asarray(geometries.geom_type == 'Point')
+    point_index = np.nonzero(is_point)[0]
+    iy, ix, inside = _nearest_pixels(ts_ds,geometries[is_point].x.values,geometries[is_point].y.values)
+    sample_geometry, sample_y, sample_x = [point_index[inside]], [iy[inside]], [ix[inside]] # points outside the stack are dropped
+    polygon_index = np.nonzero(~is_point)[0]
+    if polygon_index.size == 0:
+        return sample_geometry[0], sample_y[0], sample_x[0]
+
+    # candidate pixels inside each bounding box, enumerated for all geometries at once from sorted coordinate ranges
+    polygons = geometries.iloc[polygon_index].reset_index(drop=True)
+    bounds = polygons.bounds.values
+    x_order, y_order = np.argsort(x), np.argsort(y)
+    x_lo, x_hi = np.searchsorted(x[x_order],bounds[:,0],side='left'), np.searchsorted(x[x_order],bounds[:,2],side='right')
+    y_lo, y_hi = np.searchsorted(y[y_order],bounds[:,1],side='left'), np.searchsorted(y[y_order],bounds[:,3],side='right')
+    nx, ny = x_hi-x_lo, y_hi-y_lo
+    counts = nx*ny
+    candidate_polygon = np.repeat(np.arange(len(polygons)),counts)
+    offset = np.arange(counts.sum())-np.repeat(np.cumsum(counts)-counts,counts)
+    candidate_y = y_order[y_lo[candidate_polygon]+offset//nx[candidate_polygon]]
+    candidate_x = x_order[x_lo[candidate_polygon]+offset%nx[candidate_polygon]]
+
+    # one spatial join of the unique candidate pixel centers against all geometries
+    pixel_id = np.unique(candidate_y*x.size+candidate_x)
+    pixel_y, pixel_x = pixel_id//x.size, pixel_id%x.size
+    pixel_centers = gpd.GeoDataFrame(geometry=gpd.points_from_xy(x[pixel_x],y[pixel_y]),crs=geometries.crs)
+    joined = gpd.sjoin(pixel_centers,gpd.GeoDataFrame(geometry=polygons,crs=geometries.crs),predicate='within')
+    pixel = joined.index.values
+    sample_geometry.append(polygon_index[joined['index_right'].values])
+    sample_y.append(pixel_y[pixel])
+    sample_x.append(pixel_x[pixel])
+
+    # geometries smaller than a pixel use the pixel under their centroid
+    empty = np.setdiff1d(np.arange(len(polygons)),joined['index_right'].values)
+    if empty.size:
+        centroids = polygons.iloc[empty].centroid
+        iy, ix, inside = _nearest_pixels(ts_ds,centroids.x.values,centroids.y.values)
+        sample_geometry.append(polygon_index[empty[inside]])
+        sample_y.append(iy[inside])
+        sample_x.append(ix[inside])
+    return np.concatenate(sample_geometry), np.concatenate(sample_y), np.concatenate(sample_x)
+
+
+def extract_points(ts_ds,points_gdf,buffer=None,id_column=None,orbit_metadata=('sat:orbit_state','sat:relative_orbit','platform')):
+    '''
+    Returns backscatter time series at many points or small polygons (e.g. snow pits) in a single compute. Geometries are mapped
+    to pixel indices once, the unique pixels are sorted by chunk and gathered with one vectorized isel, so each COG block is read
+    once however many points fall in it, instead of one .sel() + compute per point.
+
+            Parameters:
+                    ts_ds (xarray dataset): backscatter stack (linear, dB or quantized), e.g. get_s1_rtc_stac() output
+                    points_gdf (geopandas GeoDataframe): points and / or polygons, any crs
+                    buffer (float): optional radius [m] around each geometry, statistics are then taken over the pixels inside
+                    id_column (str): column of points_gdf identifying each geometry, defaults to the index
+                    orbit_metadata (tuple): time coordinates of ts_ds to carry into the table when present
+
+            Returns:
+                    points_df (pandas DataFrame): tidy table with one row per (point, time): point id, time, mean backscatter, std and
+                                                  number of valid pixels over the geometry, and the orbit metadata columns.
+                                                  geometries outside the stack are left out
+    '''
+    points_gdf = points_gdf.to_crs(_stack_crs(ts_ds))
+    geometries = points_gdf.geometry if buffer is None else points_gdf.geometry.buffer(buffer)
+    point_ids = np.asarray(points_gdf.index if id_column is None else points_gdf[id_column])
+    sample_geometry, sample_y, sample_x = _geometry_pixels(ts_ds,geometries)
+    if sample_geometry.size == 0:
+        raise ValueError('none of the geometries fall within the backscatter stack')
+
+    # unique pixels, ordered by chunk so each block is visited once and contiguously
+    pixel_id = sample_y*ts_ds.sizes['x']+sample_x
+    unique_pixels, sample_pixel = np.unique(pixel_id,return_inverse=True)
+    unique_y, unique_x = unique_pixels//ts_ds.sizes['x'], unique_pixels%ts_ds.sizes['x']
+    if ts_ds.chunks is not None:
+        chunks = dict(zip(ts_ds.dims,ts_ds.chunks))
+        y_bounds = np.cumsum(chunks['y'])
+        x_bounds = np.cumsum(chunks['x'])
+        chunk_order = np.lexsort((unique_x,unique_y,np.searchsorted(x_bounds,unique_x,side='right'),np.searchsorted(y_bounds,unique_y,side='right')))
+        unique_y, unique_x = unique_y[chunk_order], unique_x[chunk_order]
+        sample_pixel = np.argsort(chunk_order)[sample_pixel]
+    gathered = ts_ds.isel(y=xr.DataArray(unique_y,dims='pixel'),x=xr.DataArray(unique_x,dims='pixel')).transpose('time','pixel')
+    values = dequantize_backscatter(gathered.compute()).values.astype('float64') # (time, pixel), one compute
+
+    # reduce samples to geometries: samples are sorted by geometry, so reduceat over contiguous runs
+    order = np.argsort(sample_geometry,kind='stable')
+    sample_values = values[:,sample_pixel[order]]
+    geometry_index, starts = np.unique(sample_geometry[order],return_index=True)
+    valid = ~np.isnan(sample_values)
+    count = np.add.reduceat(valid,starts,axis=1)
+    total = np.add.reduceat(np.where(valid,sample_values,0),starts,axis=1)
+    total_sq = np.add.reduceat(np.where(valid,sample_values**2,0),starts,axis=1)
+    with np.errstate(invalid='ignore',divide='ignore'):
+        mean = np.where(count>0,total/count,np.nan)
+        std = np.where(count>0,np.sqrt(np.maximum(total_sq/count-mean**2,0)),np.nan)
+
+    n_time = ts_ds.sizes['time']
+    points_df = pd.DataFrame({'point':np.tile(point_ids[geometry_index],n_time),
+                              'time':np.repeat(ts_ds.time.values,geometry_index.size),
+                              'backscatter':mean.reshape(-1),
+                              'backscatter_std':std.reshape(-1),
+                              'n_pixels':count.reshape(-1)})
+    for coord in orbit_metadata:
+        if coord in ts_ds.coords and ts_ds.coords[coord].dims == ('time',):
+            points_df[coord] = np.repeat(ts_ds.coords[coord].values,geometry_index.size)
+    points_df.attrs['units'] = ts_ds.attrs.get('units','linear')
+    return points_df
+
+
+def _window_stats(z,offsets):
+    # NaN-aware mean and variance of z (time,y,x) over the (dy,dx) offsets around each pixel, pixels beyond the array count as NaN
+    reach = max(max(abs(dy),abs(dx)) for dy, dx in offsets)
+    z = z.astype('float64')
+    n_y, n_x = z.shape[1], z.shape[2]
+    padded = np.pad(z,((0,0),(reach,reach),(reach,reach)),constant_values=np.nan)
+    valid = ~np.isnan(padded)
+    filled = np.where(valid,padded,0)
+    total = np.zeros(z.shape,dtype='float64')
+    total_sq = np.zeros(z.shape,dtype='float64')
+    count = np.zeros(z.shape,dtype='float64')
+    for dy, dx in offsets:
+        window = (slice(None),slice(reach+dy,reach+dy+n_y),slice(reach+dx,reach+dx+n_x))
+        total += filled[window]
+        total_sq += filled[window]**2
+        count += valid[window]
+    with np.errstate(invalid='ignore',divide='ignore'):
+        mean = total/count
+        variance = np.maximum(total_sq/count-mean**2,0)
+    return mean, variance
+
+
+def _square_offsets(window):
+    half = window//2
+    return [(dy,dx) for dy in range(-half,half+1) for dx in range(-half,half+1)]
+
+
+def _lee(z,mean,variance,enl):
+    # Lee (1980) minimum mean square error estimate for multiplicative speckle with 1/enl normalized variance
+    cu2 = 1/enl
+    with np.errstate(invalid='ignore',divide='ignore'):
+        variance_x = (variance-mean**2*cu2)/(1+cu2)
+        weight = np.clip(np.nan_to_num(variance_x/variance),0,1)
+    return np.where(np.isnan(z),np.nan,mean+weight*(z-mean))
+
+
+def _lee_block(z,window,enl):
+    z = z.astype('float64') # same precision for the in-memory and per-chunk paths
+    mean, variance = _window_stats(z,_square_offsets(window))
+    return _lee(z,mean,variance,enl).astype('float32')
+
+
+# refined Lee: 3x3 sub-window centers of the 7x7 window, the four edge directions (as pairs of opposite sub-windows) and the
+# half-window on either side of each edge (the half containing the first sub-window of the pair, then the second)
+_REFINED_LEE_DIRECTIONS = [((0,-2),(0,2)),((2,-2),(-2,2)),((-2,0),(2,0)),((-2,-2),(2,2))]
+_REFINED_LEE_HALVES = [lambda dy, dx: dx<=0, lambda dy, dx: dx>=0,
+                       lambda dy, dx: dy-dx>=0, lambda dy, dx: dy-dx<=0,
+                       lambda dy, dx: dy<=0, lambda dy, dx: dy>=0,
+                       lambda dy, dx: dy+dx<=0, lambda dy, dx: dy+dx>=0]
+
+
+def _refined_lee_block(z,enl):
+    z = z.astype('float64') # same precision for the in-memory and per-chunk paths
+    sub_mean, _ = _window_stats(z,_square_offsets(3))
+    sub_mean[np.isnan(z)] = np.nan # sub-windows centered on nodata (or beyond the stack) are missing, not partial
+    padded = np.pad(sub_mean,((0,0),(2,2),(2,2)),constant_values=np.nan)
+    n_y, n_x = z.shape[1], z.shape[2]
+    def sub(dy,dx):
+        return padded[:,2+dy:2+dy+n_y,2+dx:2+dx+n_x]
+    gradients = np.stack([np.abs(sub(*a)-sub(*b)) for a, b in _REFINED_LEE_DIRECTIONS])
+    direction = np.argmax(np.nan_to_num(gradients,nan=-1),axis=0)
+    # pick the side of the edge whose outer sub-window looks most like the center
+    first_closer = np.stack([np.nan_to_num(np.abs(sub(*a)-sub(0,0)),nan=np.inf) <= np.nan_to_num(np.abs(sub(*b)-sub(0,0)),nan=np.inf) for a, b in _REFINED_LEE_DIRECTIONS])
+    half = 2*direction+np.where(np.take_along_axis(first_closer,direction[None],axis=0)[0],0,1)
+    mean = np.full(z.shape,np.nan)
+    variance = np.full(z.shape,np.nan)
+    for i, in_half in enumerate(_REFINED_LEE_HALVES):
+        selected = half==i
+        if selected.any():
+            half_mean, half_variance = _window_stats(z,[o for o in _square_offsets(7) if in_half(*o)])
+            mean[selected], variance[selected] = half_mean[selected], half_variance[selected]
+    return _lee(z,mean,variance,enl).astype('float32')
+
+
+def _temporal_block(z,window,time_window):
+    # Quegan & Yu (2001) multitemporal filter: local mean times the temporal average of the ratio images over +-time_window acquisitions
+    z = z.astype('float64') # same precision for the in-memory and per-chunk paths
+    local_mean, _ = _window_stats(z,_square_offsets(window))
+    with np.errstate(invalid='ignore',divide='ignore'):
+        ratio = z/local_mean
+    padded = np.pad(ratio,((time_window,time_window),(0,0),(0,0)),constant_values=np.nan)
+    valid = ~np.isnan(padded)
+    filled = np.where(valid,padded,0)
+    n_t = z.shape[0]
+    total = sum(filled[k:k+n_t] for k in range(2*time_window+1))
+    count = sum(valid[k:k+n_t] for k in range(2*time_window+1))
+    with np.errstate(invalid='ignore',divide='ignore'):
+        filtered = local_mean*total/count
+    return np.where(np.isnan(z),np.nan,filtered).astype('float32')
+
+
+def speckle_filter(ts_ds,method='lee',window=7,enl=4.4,time_window=2):
+    '''
+    Returns a speckle filtered backscatter stack. Dask-backed stacks (e.g. get_s1_rtc_stac() output) stay lazy: the filter runs per chunk
+    in parallel through dask map_overlap with a halo of window//2 pixels (and time_window acquisitions for the temporal filter), so the
+    result can feed get_runoff_onset() or the binning functions without materializing a filtered cube. Pixels outside the stack and NaN
+    pixels are left out of the local statistics, and NaN pixels stay NaN. Filtering is done on linear power, dB and quantized input is
+    converted and the output is returned in the input units (float32).
+
+            Parameters:
+                    ts_ds (xarray dataset): backscatter stack with dims time, y, x
+                    method (str): lee (square window Lee), refined_lee (edge-aligned 7x7 Lee) or temporal (Quegan & Yu multitemporal multi-look)
+                    window (int): odd spatial window size [pixels] for lee and for the local means of temporal, refined_lee always uses 7
+                    enl (float): equivalent number of looks of the input, about 4.4 for Sentinel-1 IW GRD
+                    time_window (int): the temporal filter averages over +-time_window acquisitions
+
+            Returns:
+                    filtered_ds (xarray dataset): speckle filtered stack, same dims, coords and units as ts_ds
+    '''
+    if method == 'lee':
+        block_function, half, depth_t = (lambda z: _lee_block(z,window,enl)), window//2, 0
+    elif method == 'refined_lee':
+        block_function, half, depth_t = (lambda z: _refined_lee_block(z,enl)), 3, 0
+    elif method == 'temporal':
+        block_function, half, depth_t = (lambda z: _temporal_block(z,window,time_window)), window//2, time_window
+    else:
+        raise ValueError(f'method must be lee, refined_lee or temporal, got {method}')
+
+    decoded = dequantize_backscatter(ts_ds).transpose('time','y','x')
+    in_db = decoded.attrs.get('units') == 'dB'
+    linear = 10**(decoded/10) if in_db else decoded
+
+    if linear.chunks is None:
+        filtered = block_function(linear.values)
+    else:
+        data = linear.data
+        if depth_t and min(data.chunks[0]) < depth_t: # stackstac uses one acquisition per chunk
+            data = data.rechunk({0:2*depth_t+1})
+        filtered = data.map_overlap(block_function,depth={0:depth_t,1:half,2:half},boundary=np.nan,dtype='float32',meta=np.array((),dtype='float32'))
+
+    filtered_ds = linear.copy(data=filtered)
+    if in_db:
+        filtered_ds = (10*np.log10(filtered_ds)).astype('float32')
+    filtered_ds.attrs = dict(decoded.attrs)
+    return filtered_ds
+
+
+def same_pass_groups(ts_ds):
+    '''
+    Returns the time indices of the acquisitions of each satellite pass, i.e. the adjacent frames of one (platform, relative orbit, date)
+    that stackstac keeps as separate, mostly NaN time slices seconds apart. Uses only the time coordinates, no data is read.
+
+            Parameters:
+                    ts_ds (xarray dataset): backscatter stack with platform and sat:relative_orbit time coordinates
+
+            Returns:
+                    groups (list): one array of time indices per pass, in time order
+    '''
+    metadata = pd.DataFrame({'platform':ts_ds.coords['platform'].values,
+                             'relative_orbit':ts_ds.coords['sat:relative_orbit'].values,
+                             'date':pd.to_datetime(ts_ds.time.values).floor('D')})
+    groups = [np.asarray(index) for index in metadata.groupby(['platform','relative_orbit','date'],sort=False).indices.values()]
+    groups.sort(key=lambda index: index.min())
+    return groups
+
+
+def merge_same_pass(ts_ds,how='first'):
+    '''
+    Mosaics the frames of each satellite pass (see same_pass_groups()) into a single time slice, shrinking the time axis, and the cost of
+    every downstream reduction, before computing onsets, climatologies, etc. Grouping is metadata only and the mosaic stays lazy.
+    Each merged slice keeps the time and metadata of the pass's first frame. Works on linear, dB and quantized stacks.
+
+            Parameters:
+                    ts_ds (xarray dataset): backscatter stack, e.g. get_s1_rtc_stac() output
+                    how (str): first (take each pixel from the first frame that has data) or mean (average overlapping frames)
+
+            Returns:
+                    merged_ds (xarray dataset): stack with one time slice per pass
+    '''
+    if how not in ('first','mean'):
+        raise ValueError(f'how must be first or mean, got {how}')
+    groups = same_pass_groups(ts_ds)
+    pass_id = np.empty(ts_ds.sizes['time'],dtype='int64')
+    for i, index in enumerate(groups):
+        pass_id[index] = i
+    first_frames = np.array([index.min() for index in groups])
+
+    # one lazy groupby reduction over all passes instead of a per-pass graph
+    grouped = dequantize_backscatter(ts_ds).assign_coords(pass_id=('time',pass_id)).groupby('pass_id')
+    merged_ds = grouped.first(skipna=True) if how == 'first' else grouped.mean(dim='time',skipna=True)
+    merged_ds = merged_ds.rename({'pass_id':'time'}).drop_vars('time')
+    first_coords = ts_ds.isel(time=first_frames).coords
+    merged_ds = merged_ds.assign_coords({name: coord.variable for name, coord in first_coords.items() if 'time' in coord.dims})
+    merged_ds = merged_ds.transpose(*ts_ds.dims)
+    merged_ds.attrs = dict(ts_ds.attrs)
+    if np.issubdtype(ts_ds.dtype,np.integer):
+        merged_ds.attrs = {k: v for k, v in ts_ds.attrs.items() if k not in ('scale_factor','add_offset','_FillValue')}
+        merged_ds = quantize_backscatter(merged_ds,dtype=str(ts_ds.dtype),scale_factor=ts_ds.attrs.get('scale_factor',DB_SCALE_FACTOR),
+                                         add_offset=ts_ds.attrs.get('add_offset',DB_ADD_OFFSET),nodata=ts_ds.attrs.get('_FillValue',DB_NODATA))
+    return merged_ds
@@ -0,0 +1,405 @@
+"""Plotting functions for Sentinel-1 backscatter stacks and their ancillary data.
+
+Author: Eric Gagliano (egagli@uw.edu)
+Updated: 10/2026
+"""
+
+import math
+import numpy as np
+import pandas as pd
+import hvplot.xarray
+import rioxarray
+import matplotlib.pyplot as plt
+from datetime import datetime
+import warnings
+import contextily as ctx
+
+from .core import dequantize_backscatter, _backscatter_label
+from .ancillary import AOIContext
+
+def plot_sentinel1_acquisitons(ts_ds,ax=None,start_date='2015-01-01',end_date=datetime.today().strftime('%Y-%m-%d'),textsize=8):
+    
+    if ax is None:
+        ax = plt.gca()
+    f = plt.gcf()
+    
+    asc = ts_ds[ts_ds.coords['sat:orbit_state']=='ascending']
+    desc = ts_ds[ts_ds.coords['sat:orbit_state']=='descending']
+
+    #f,ax=plt.subplots(figsize=(30,7))
+                
+    ax.scatter(np.array(asc.time),asc['sat:relative_orbit'],label='Ascending',c='red')
+    ax.scatter(np.array(desc.time),desc['sat:relative_orbit'],label='Descending',c='blue')
+
+    for i, label in enumerate(list(pd.to_datetime(asc.time.values).strftime('%Y-%m-%d \n %H:%M:%S'))):
+        plt.annotate(label, (asc.time.values[i], asc['sat:relative_orbit'][i]),fontsize=textsize,rotation=45)
+    
+    for i, label in enumerate(list(pd.to_datetime(desc.time.values).strftime('%Y-%m-%d \n%H:%M:%S'))):
+        plt.annotate(label, (desc.time.values[i], desc['sat:relative_orbit'][i]),fontsize=textsize,rotation=45)
+    
+    ax.legend()
+    
+    if start_date != '2015-01-01':
+        ax.set_xlim([start_date,end_date])
+        
+    ax.set_ylim([0,200])
+    ax.set_title('Sentinel-1 Relative Orbits')
+    ax.set_xlabel('Datetime [UTC]')
+    plt.tight_layout()
+
+def plot_timeseries_by_elevation_bin(ts_ds,dem_ds,bin_size=100,ax=None,normalize_bins=False):
+    if ax is None:
+        ax = plt.gca()
+    f = plt.gcf()
+    
+    ts_ds = dequantize_backscatter(ts_ds)
+    dem_projected_ds = dem_ds.rio.reproject_match(ts_ds) # squeeze??
+    dem_projected_ds = dem_projected_ds.where(ts_ds!=np.nan) # here mask DEM by ts_ds
+    
+    bin_centers=list(range(int(math.floor(dem_projected_ds.max()/100)*100)-bin_size//2,int(math.ceil(dem_projected_ds.min()/100)*100),-bin_size))
+    backscatter_full = []
+
+    for i,bin_center in enumerate(bin_centers):
+        ts_bin_ds = ts_ds.where(np.abs(dem_projected_ds - bin_center) < bin_size//2)
+        with warnings.catch_warnings(): #catches np.nanmean empty slices
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            backscatter_ts_for_bin = np.nanmean(ts_bin_ds.data.reshape(ts_bin_ds.shape[0],-1), axis=1) 
+        backscatter_full.append(list(backscatter_ts_for_bin))
+        
+    backscatter_df = pd.DataFrame(backscatter_full,index=bin_centers,columns=ts_ds.time)
+    
+    if normalize_bins == True:
+          backscatter_df = ((backscatter_df.T-backscatter_df.T.min())/(backscatter_df.T.max()-backscatter_df.T.min())).T
+    colors = ax.pcolormesh(pd.to_datetime(ts_ds.time), bin_centers, backscatter_df,cmap='inferno',edgecolors=(1.0, 1.0, 1.0, 0.3)) #,vmin=0,vmax=0.5
+    cbar = f.colorbar(colors,ax=ax)
+    
+    if normalize_bins == False:
+        lab = f'Mean {_backscatter_label(ts_ds)}'
+    else:
+        lab = 'Normalized (Elevation-wise) Backscatter'
+    
+    cbar.ax.set_ylabel(lab, rotation=90, labelpad=15)
+
+    ax.set_xlabel('Time')
+    ax.set_ylabel('Elevation [m]')
+    return ax
+
+def plot_timeseries_by_dah_bin(ts_ds,dem_ds,bin_size=0.25,ax=None,normalize_bins=False):
+    if ax is None:
+        ax = plt.gca()
+    f = plt.gcf()
+    
+    ts_ds = dequantize_backscatter(ts_ds)
+    dem_projected_ds = dem_ds.rio.reproject_match(ts_ds) # squeeze??
+    dem_projected_ds = dem_projected_ds.where(ts_ds!=np.nan) # here mask DEM by ts_ds
+    
+    bin_centers=list(np.arange(-1+bin_size/2,1,bin_size))
+    backscatter_full = []
+
+    for i,bin_center in enumerate(bin_centers):
+        ts_bin_ds = ts_ds.where(np.abs(dem_projected_ds - bin_center) < bin_size/2)
+        with warnings.catch_warnings(): #catches np.nanmean empty slices
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            backscatter_ts_for_bin = np.nanmean(ts_bin_ds.data.reshape(ts_bin_ds.shape[0],-1), axis=1) 
+        backscatter_full.append(list(backscatter_ts_for_bin))
+        
+    backscatter_df = pd.DataFrame(backscatter_full,index=bin_centers,columns=ts_ds.time)
+    
+    if normalize_bins == True:
+          backscatter_df = ((backscatter_df.T-backscatter_df.T.min())/(backscatter_df.T.max()-backscatter_df.T.min())).T
+    colors = ax.pcolormesh(bin_centers, pd.to_datetime(ts_ds.time), backscatter_df.T,cmap='inferno',edgecolors=(1.0, 1.0, 1.0, 0.3)) #,vmin=0,vmax=0.5
+    cbar = f.colorbar(colors,ax=ax,location='top',orientation='horizontal')
+    
+    if normalize_bins == False:
+        lab = f'Mean {_backscatter_label(ts_ds)}'
+    else:
+        lab = 'Normalized (DAH-wise) Backscatter'
+    
+    #cbar.ax.set_ylabel(lab, rotation=270, labelpad=15)
+    
+    ax.set_xlabel('Diurnal Anisotropic Heating Index')
+    ax.set_ylabel('Time')
+    return ax
+
+def plot_hyposometry(ts_ds,dem_ds,bin_size=100,ax=None):
+    if ax is None:
+        ax = plt.gca()
+    f = plt.gcf()    
+    dem_projected_ds = dem_ds.rio.reproject_match(ts_ds) # squeeze??
+    dem_projected_ds = dem_projected_ds.where(ts_ds!=np.nan) # here mask DEM by ts_ds
+    bin_edges=list(range(int(math.floor(dem_projected_ds.max()/100)*100)+bin_size,int(math.ceil(dem_projected_ds.min()/100)*100)-bin_size,-bin_size))
+    ax.hist(dem_projected_ds.squeeze().isel(time=0).to_numpy().ravel(),bins=bin_edges[::-1],orientation='horizontal',histtype='bar',ec='k')
+    ax.set_ylim([np.array(bin_edges).min(),np.array(bin_edges).max()])
+    ax.set_xlabel('# of Pixels')
+    ax.set_ylabel('Elevation [m]')
+    ax.set_title('Hyposometry Plot')
+    return ax
+
+
+def plot_dah_bins(ts_ds,dem_ds,bin_size=0.25,ax=None):
+    if ax is None:
+        ax = plt.gca()
+    f = plt.gcf()    
+    dem_projected_ds = dem_ds.rio.reproject_match(ts_ds) # squeeze??
+    dem_projected_ds = dem_projected_ds.where(ts_ds!=np.nan) # here mask DEM by ts_ds
+    bin_edges=list(np.arange(-1,1+bin_size,bin_size))
+    ax.hist(dem_projected_ds.squeeze().isel(time=0).to_numpy().ravel(),bins=bin_edges[::1],orientation='vertical',histtype='bar',ec='k')
+    ax.set_xlim([-1,1])
+    ax.set_ylabel('# of Pixels')
+    ax.set_xlabel('DAH')
+    ax.set_title('DAH Index Histogram')
+    return ax
+
+
+def plot_backscatter_ts_and_ndvi(ts_ds,ndvi_ds):
+    frames = dequantize_backscatter(ts_ds)
+    frames_ndvi_all = ndvi_ds
+    mins_info = frames.argmin(dim='time',skipna=False)
+    f,ax=plt.subplots(3,2,figsize=(20,10))
+    frames[mins_info].time.dt.dayofyear.where(frames_ndvi_all.values<0.2).plot(ax=ax[0,0],cmap='twilight')
+    ax[0,0].set_title('Runoff Date w/ No Vegetation \n (NDVI < 0.2)')
+    frames[mins_info].time.dt.dayofyear.where(frames_ndvi_all.values>0.2).where(frames_ndvi_all.values<0.6).plot(ax=ax[1,0],cmap='twilight')
+    ax[1,0].set_title('Runoff Date w/ Sparse to Moderate Vegetation \n (0.2 < NDVI < 0.6)')
+    #frames[mins_info].time.dt.dayofyear.where(frames_ndvi_all.values>0.4).where(frames_ndvi_all.values<0.6).plot(ax=ax[2,0])
+    #ax[2,0].set_title('Runoff Date w/ Moderate Vegetation \n (0.4 < NDVI < 0.6)')
+    frames[mins_info].time.dt.dayofyear.where(frames_ndvi_all.values>0.6).plot(ax=ax[2,0],cmap='twilight')
+    ax[2,0].set_title('Runoff Date w/ Dense Vegetation \n (NDVI > 0.6)')
+
+    ax[0,0].set_aspect('equal')
+    ax[1,0].set_aspect('equal')
+    ax[2,0].set_aspect('equal')
+
+    ax[0,1].plot(frames.where(frames_ndvi_all.values<0.2).time,frames.where(frames_ndvi_all.values<0.2).mean(dim=['x','y']))
+
+    ax[1,1].plot(frames.where(frames_ndvi_all.values>0.2).where(frames_ndvi_all.values<0.6).time,frames.where(frames_ndvi_all.values>0.2).where(frames_ndvi_all.values<0.6).mean(dim=['x','y']))
+
+    #ax[2,1].plot(frames.where(frames_ndvi_all.values>0.4).where(frames_ndvi_all.values<0.6).time,frames.where(frames_ndvi_all.values>0.4).where(frames_ndvi_all.values<0.6).mean(dim=['x','y']))
+
+    ax[2,1].plot(frames.where(frames_ndvi_all.values>0.6).time,frames.where(frames_ndvi_all.values>0.6).mean(dim=['x','y']))
+
+    ax[0,1].set_title('Backscatter Time Series')
+    ax[1,1].set_title('Backscatter Time Series')
+    ax[2,1].set_title('Backscatter Time Series')
+
+    ax[0,1].set_ylabel(_backscatter_label(frames))
+    ax[1,1].set_ylabel(_backscatter_label(frames))
+    ax[2,1].set_ylabel(_backscatter_label(frames))
+
+    if frames.attrs.get('units') != 'dB':
+        ax[0,1].set_ylim([0,0.5])
+        ax[1,1].set_ylim([0,0.5])
+        ax[2,1].set_ylim([0,0.5])
+
+    plt.tight_layout()
+
+def _aoi_context(ts_ds,context):
+    # axes and basemap come from ts_ds while the plotted products come from the context, so both must describe the same stack
+    if context is None:
+        return AOIContext(ts_ds)
+    if context.ts_ds is not ts_ds:
+        raise ValueError('context was built for a different backscatter stack, pass AOIContext(ts_ds) or context=None')
+    return context
+
+def plot_closest_snotel(ts_ds,distance_cutoff=30,ax=None,context=None):
+    
+    if ax is None:
+        ax = plt.gca()
+    f = plt.gcf()    
+    context = _aoi_context(ts_ds,context)
+    
+    sites_gdf = context.snotel_sites
+    
+    first_scene = dequantize_backscatter(ts_ds.isel(time=0))
+    first_scene.plot(ax=ax,vmax=None if first_scene.attrs.get('units') == 'dB' else 1.0,cmap='gray',add_colorbar=False)
+    sites_gdf = sites_gdf[sites_gdf['distance_km']<distance_cutoff]
+    color = sites_gdf.plot(column='distance_km',ax=ax,vmax=distance_cutoff,legend=True,cmap='viridis_r',legend_kwds={'label':'Distance from Study Site [km]','orientation':'vertical','fraction':0.0466,'pad':0.02})
+    minx, miny, maxx, maxy = ts_ds.rio.bounds()
+    ax.set_xlim([minx-1000*distance_cutoff*1.2,maxx+1000*distance_cutoff*1.2])
+    ax.set_ylim([miny-1000*distance_cutoff*1.2,maxy+1000*distance_cutoff*1.2])
+
+    ctx.add_basemap(ax=ax, crs=sites_gdf.crs, source=ctx.providers.Stamen.Terrain)
+
+    ax.set_title('SNOTEL Sites Around Study Site')
+    plt.tight_layout(rect=[0, 0, 0.9, 0.90])
+
+    for x, y, label1, label2, label3 in zip(sites_gdf.geometry.x, sites_gdf.geometry.y, sites_gdf.name, sites_gdf.code, sites_gdf.distance_km):
+        ax.annotate(f'{label1} \n{label2} \n{label3:.2f} km', xy=(x, y), xytext=(15, -30), textcoords="offset points", fontsize=10,bbox=dict(facecolor='yellow', edgecolor='black', boxstyle='round,pad=0.5'))
+    
+    return ax
+
+def plot_bs_ndsi_swe_precip(ts_ds,ax=None,start_date='1900-01-01', end_date=datetime.today().strftime('%Y-%m-%d'),context=None):
+    # pass the same AOIContext to several figure functions to fetch NDSI / SNOTEL and compute orbit means only once
+    if ax is None:
+        ax = plt.gca()
+    f = plt.gcf()    
+    context = _aoi_context(ts_ds,context)
+    
+    plt.style.use('seaborn-dark')
+
+    snwd_ax = ax.twinx()
+    precip_ax = ax.twinx()
+    ndsi_ax = ax.twinx()
+    
+    #host.set_xlim(0, 2)
+    #host.set_ylim(0, 2)
+    #par1.set_ylim(0, 4)
+    #par2.set_ylim(1, 65)
+    #snwd_ax.set_ylim(bottom=0)
+    snwd_ax.set_ylim([0,480])
+
+    
+    ax.set_xlabel("Time")
+    ax.set_ylabel(_backscatter_label(ts_ds))
+    snwd_ax.set_ylabel("Snow Depth / SWE [cm]")
+    precip_ax.set_ylabel("Precipitation [cm]")
+    ndsi_ax.set_ylabel("NDSI")
+
+    #bs_plot1, = ax.plot(ts_ds[ts_ds.coords['sat:orbit_state']=='ascending'].time,ts_ds[ts_ds.coords['sat:orbit_state']=='ascending'].mean(dim=['x','y']),color='red',label='Backscatter (Ascending)')
+    #bs_plot2, = ax.plot(ts_ds[ts_ds.coords['sat:orbit_state']=='descending'].time,ts_ds[ts_ds.coords['sat:orbit_state']=='descending'].mean(dim=['x','y']),color='orange',label='Backscatter (Descending)')
+    for orbit, (direction, orbit_mean) in context.orbit_means.items():
+        ax.plot(orbit_mean.time,orbit_mean,label=f'Orbit {orbit} ({direction})')
+
+    ndsi_mean = context.ndsi_mean
+    ndsi_plot, = ndsi_ax.plot(ndsi_mean.time,ndsi_mean,color='black',label='NDSI')
+    snotel_snwd = context.snotel('SNOTEL:SNWD_D')
+    snwd_plot = snwd_ax.scatter(snotel_snwd.index,2.54*snotel_snwd.iloc[:,0],color='blueviolet',alpha=0.7,label='Snow Depth')
+    
+    snotel_swe = context.snotel('SNOTEL:WTEQ_D')
+    swe_plot = snwd_ax.scatter(snotel_swe.index,2.54*snotel_swe.iloc[:,0],color='darkturquoise',alpha=0.7,label='SWE')
+    
+    #print(snotel_snwd)
+    #ax.scatter(x=snotel_snwd.index,y=snotel_snwd['value'],label='Snow Depth')
+    snotel_precip = context.snotel('SNOTEL:PRCPSA_D')
+    precip_plot = precip_ax.bar(snotel_precip.index,2.54*snotel_precip.iloc[:,0],color='blue',alpha=0.4,label='Precipitation')
+    lns = [ndsi_plot,snwd_plot,swe_plot,precip_plot]
+    ax.legend(handles=lns,loc='best')
+    
+    extra_legend = ax.legend(handles=lns,loc='upper center')
+    ax.legend(loc='upper right')
+    ax.add_artist(extra_legend)
+    #time_slice = slice('2015-01-01','2022-01-01')
+    #ax.set_xlim([time_slice.start,time_slice.stop])
+    
+    precip_ax.spines['right'].set_position(('outward', 60))
+    ndsi_ax.spines['left'].set_position(('outward', 60))
+    #ndsi_ax.yaxis.label.set_position(('outward', 60))
+    
+    ndsi_ax.spines["left"].set_visible(True)
+    ndsi_ax.yaxis.set_label_position('left') 
+    ndsi_ax.yaxis.set_ticks_position('left')
+    
+    #ax.yaxis.label.set_color(bs_plot1.get_color())
+    ndsi_ax.yaxis.label.set_color(ndsi_plot.get_color())
+    snwd_ax.yaxis.label.set_color('blueviolet')
+    precip_ax.yaxis.label.set_color('blue')
+    
+    ax.set_xlim([datetime.strptime(start_date,'%Y-%m-%d'),datetime.strptime(end_date,'%Y-%m-%d')])   
+    
+    ax.set_title('S1 Backscatter, S2 NDSI, SNOTEL Snow Depth, SWE, and Precipitation')
+    plt.tight_layout()
+    
+def plot_bs_ndsi_swe_precip_with_context(ts_ds,start_date='1900-01-01', end_date=datetime.today().strftime('%Y-%m-%d'),context=None):
+    # pass the same AOIContext to several figure functions to fetch NDSI / SNOTEL and compute orbit means only once
+    
+    f,ax=plt.subplots(1,2,figsize=(25,5),gridspec_kw={'width_ratios': [1, 3]})
+    context = _aoi_context(ts_ds,context)
+    
+    plt.style.use('seaborn-dark')
+
+    snwd_ax = ax[1].twinx()
+    precip_ax = ax[1].twinx()
+    ndsi_ax = ax[1].twinx()
+    
+    #host.set_xlim(0, 2)
+    #host.set_ylim(0, 2)
+    #par1.set_ylim(0, 4)
+    #par2.set_ylim(1, 65)
+    #snwd_ax.set_ylim(bottom=0)
+    snwd_ax.set_ylim([0,480])
+
+    
+    ax[1].set_xlabel("Time")
+    ax[1].set_ylabel(_backscatter_label(ts_ds))
+    snwd_ax.set_ylabel("Snow Depth / SWE [cm]")
+    precip_ax.set_ylabel("Precipitation [cm]")
+    ndsi_ax.set_ylabel("NDSI")
+
+    #bs_plot1, = ax[1].plot(ts_ds[ts_ds.coords['sat:orbit_state']=='ascending'].time,ts_ds[ts_ds.coords['sat:orbit_state']=='ascending'].mean(dim=['x','y']),color='red',label='Backscatter (Ascending)')
+    #bs_plot2, = ax[1].plot(ts_ds[ts_ds.coords['sat:orbit_state']=='descending'].time,ts_ds[ts_ds.coords['sat:orbit_state']=='descending'].mean(dim=['x','y']),color='orange',label='Backscatter (Descending)')
+
+    for orbit, (direction, orbit_mean) in context.orbit_means.items():
+        ax[1].plot(orbit_mean.time,orbit_mean,label=f'Orbit {orbit} ({direction})')
+    #ax[1].legend()
+    
+    
+    ndsi_mean = context.ndsi_mean
+    ndsi_plot, = ndsi_ax.plot(ndsi_mean.time,ndsi_mean,color='black',label='NDSI')
+    snotel_snwd = context.snotel('SNOTEL:SNWD_D')
+    snwd_plot = snwd_ax.scatter(snotel_snwd.index,2.54*snotel_snwd.iloc[:,0],color='blueviolet',alpha=0.7,label='Snow Depth')
+    
+    snotel_swe = context.snotel('SNOTEL:WTEQ_D')
+    swe_plot = snwd_ax.scatter(snotel_swe.index,2.54*snotel_swe.iloc[:,0],color='darkturquoise',alpha=0.7,label='SWE')
+    
+    #print(snotel_snwd)
+    #ax.scatter(x=snotel_snwd.index,y=snotel_snwd['value'],label='Snow Depth')
+    snotel_precip = context.snotel('SNOTEL:PRCPSA_D')
+    snotel_temp = context.snotel('SNOTEL:TAVG_D')
+    snotel_temp=(snotel_temp-32)/1.8
+    temp_precip_gdf = pd.concat([snotel_temp,snotel_precip],axis=1,join='inner')
+    temp_precip_gdf.set_axis(['Temperature','Precip'],axis=1,inplace=True)
+    conditions = [(temp_precip_gdf['Temperature'] <=0),(temp_precip_gdf['Temperature'] > 0)]
+    values = ['lightcoral', 'blue']
+    temp_precip_gdf['bar_color'] = np.select(conditions, values)
+    
+    
+    precip_plot = precip_ax.bar(temp_precip_gdf.index,2.54*temp_precip_gdf.iloc[:,1],color=temp_precip_gdf['bar_color'],alpha=0.4,label='Precipitation')
+    lns = [ndsi_plot,snwd_plot,swe_plot,precip_plot]
+    extra_legend = ax[1].legend(handles=lns,loc='upper center')
+    ax[1].legend(loc='upper right')
+    ax[1].add_artist(extra_legend)
+    #time_slice = slice('2015-01-01','2022-01-01')
+    #ax.set_xlim([time_slice.start,time_slice.stop])
+    
+    precip_ax.spines['right'].set_position(('outward', 60))
+    ndsi_ax.spines['left'].set_position(('outward', 60))
+    #ndsi_ax.yaxis.label.set_position(('outward', 60))
+    
+    ndsi_ax.spines["left"].set_visible(True)
+    ndsi_ax.yaxis.set_label_position('left') 
+    ndsi_ax.yaxis.set_ticks_position('left')
+    
+    #ax[1].yaxis.label.set_color(bs_plot1.get_color())
+    ndsi_ax.yaxis.label.set_color(ndsi_plot.get_color())
+    snwd_ax.yaxis.label.set_color('blueviolet')
+    precip_ax.yaxis.label.set_color('blue')
+    
+    ax[1].set_xlim([datetime.strptime(start_date,'%Y-%m-%d'),datetime.strptime(end_date,'%Y-%m-%d')])   
+    
+    plt.tight_layout()
+    
+    
+    sites_gdf = context.snotel_sites
+    context.closest_snotel.plot(ax=ax[0],color='red',marker='*')
+    
+    for x, y, label1, label2, label3, label4 in zip(sites_gdf.geometry.x, sites_gdf.geometry.y, sites_gdf.name, sites_gdf.code, sites_gdf.distance_km, sites_gdf.elevation_m):
+        ax[0].annotate(f'{label1} \n{label2} \nElevation:{label4:.0f} m \nProximity:{label3:.2f} km', xy=(x, y), xytext=(15, -30), textcoords="offset points", fontsize=10,bbox=dict(facecolor='yellow', edgecolor='black', boxstyle='round,pad=0.5'))
+        break
+    
+    minx, miny, maxx, maxy = ts_ds.rio.bounds()
+    distance_cutoff=6
+
+    
+    #ts_ds.isel(time=0).plot(ax=ax[0],vmax=1.0,cmap='gray',add_colorbar=False)
+    context.runoff_onset.dt.dayofyear.plot(ax=ax[0],cmap='twilight')
+
+    
+    ax[0].set_xlim([minx-1000*distance_cutoff*1.2,maxx+1000*distance_cutoff*1.2])
+    ax[0].set_ylim([miny-1000*distance_cutoff*1.2,maxy+1000*distance_cutoff*1.2])
+    
+    ctx.add_basemap(ax=ax[0], crs=ts_ds.rio.crs, source=ctx.providers.Stamen.Terrain)
+    ax[0].set_title('Area of Interest')
+    
+
+    
+    site_name = context.closest_snotel['code'].values[0]
+    ax[1].set_title(f'S1 Backscatter, S2 NDSI, {site_name} Snow Depth, SWE, and Precipitation')
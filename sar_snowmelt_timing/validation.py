@@ -0,0 +1,152 @@
+"""Station-scale validation of runoff onset maps against SNOTEL snow disappearance (melt-out) and peak SWE dates.
+
+Runs offline: SNOTEL records are read from a local cache written by sar_snowmelt_timing.ancillary.cache_snotel() (or from
+any {site code: SWE series} fixture), and the onset at all stations of a tile is gathered with one vectorized isel.
+
+Author: Eric Gagliano (egagli@uw.edu)
+Updated: 10/2026
+"""
+
+import os
+import glob
+import numpy as np
+import pandas as pd
+import xarray as xr
+import geopandas as gpd
+
+from .core import _nearest_pixels, _stack_crs
+
+
+def load_snotel_cache(cache_dir,variable_code='SNOTEL:WTEQ_D'):
+    '''
+    Reads a SNOTEL cache written by cache_snotel().
+
+            Parameters:
+                    cache_dir (str): cache directory
+                    variable_code (str): SNOTEL variable to read
+
+            Returns:
+                    sites_gdf (geopandas GeoDataframe): cached stations (code, name, elevation_m), EPSG:4326
+                    values_by_site (dict): {site code: pandas Series of daily values}
+    '''
+    sites_gdf = gpd.read_file(os.path.join(cache_dir,'sites.geojson'))
+    suffix = f"_{variable_code.split(':')[-1]}.csv"
+    values_by_site = {}
+    for path in glob.glob(os.path.join(cache_dir,f'*{suffix}')):
+        site_code = os.path.basename(path)[:-len(suffix)]
+        values_by_site[site_code] = pd.read_csv(path,index_col=0,parse_dates=True)['value']
+    return sites_gdf, values_by_site
+
+
+def snotel_melt_dates(swe,water_year_start_month=10,melt_out_threshold=0.0,min_peak_swe=1.0):
+    '''
+    Returns the peak SWE and snow disappearance (melt-out) dates of each water year of a SNOTEL SWE record.
+
+            Parameters:
+                    swe (pandas Series): daily SWE with a datetime index
+                    water_year_start_month (int): first month of the water year, water years are named by the calendar year they end in
+                    melt_out_threshold (float): SWE at or below which the snowpack is considered gone, same units as swe
+                    min_peak_swe (float): water years with a lower peak are skipped (no seasonal snowpack), same units as swe
+
+            Returns:
+                    melt_dates_df (pandas DataFrame): indexed by water year with peak_swe, peak_swe_date and melt_out_date
+                                                      (NaT if the record ends before melt-out)
+    '''
+    swe = swe.dropna().sort_index()
+    water_year = swe.index.year+(swe.index.month>=water_year_start_month)
+    rows = {}
+    for year, season in swe.groupby(water_year):
+        peak_swe_date = season.idxmax()
+        if season[peak_swe_date] < min_peak_swe:
+            continue
+        after_peak = season[peak_swe_date:]
+        melted = after_peak[after_peak<=melt_out_threshold]
+        rows[year] = {'peak_swe':season[peak_swe_date],'peak_swe_date':peak_swe_date,'melt_out_date':melted.index[0] if len(melted) else pd.NaT}
+    melt_dates_df = pd.DataFrame.from_dict(rows,orient='index',columns=['peak_swe','peak_swe_date','melt_out_date'])
+    melt_dates_df.index.name = 'water_year'
+    return melt_dates_df
+
+
+def _naive_day(date):
+    # SNOTEL timestamps are UTC-aware, onset maps are naive calendar days
+    if pd.isnull(date):
+        return pd.NaT
+    date = pd.Timestamp(date)
+    if date.tzinfo is not None:
+        date = date.tz_convert(None)
+    return date.normalize()
+
+
+def validate_runoff_onset(runoff_onsets,sites_gdf,swe_by_site,bin_size=500,**melt_kwargs):
+    '''
+    Compares runoff onset maps with SNOTEL melt-out and peak SWE dates at every station inside each map.
+
+            Parameters:
+                    runoff_onsets (dict): {(tile, year, orbit): runoff onset raster}, rasters are get_runoff_onset() output (dates) or day of
+                                          year of the calendar year `year`. maps of the same tile must share a grid, stations are located
+                                          on it once per tile. `year` is matched to the SNOTEL water year (see snotel_melt_dates()), so
+                                          a December peak SWE of the previous calendar year is compared with the right season
+                    sites_gdf (geopandas GeoDataframe): stations with code and elevation_m, e.g. from load_snotel_cache() or find_closest_snotel()
+                    swe_by_site (dict): {site code: daily SWE series}, e.g. from load_snotel_cache()
+                    bin_size (float): station elevation band width [m]
+                    **melt_kwargs: passed to snotel_melt_dates()
+
+            Returns:
+                    stations_df (pandas DataFrame): one row per (tile, year, orbit, station) with onset day of year, onset, melt-out and
+                                                    peak SWE dates and the errors onset_minus_melt_out and onset_minus_peak_swe [days],
+                                                    computed from the dates so they stay correct across January 1
+    '''
+    melt_dates = {code: snotel_melt_dates(swe,**melt_kwargs) for code, swe in swe_by_site.items()}
+    sites_gdf = sites_gdf[sites_gdf['code'].isin(list(melt_dates))]
+    station_pixels = {}
+    frames = []
+    for (tile, year, orbit), onset in runoff_onsets.items():
+        if tile not in station_pixels:
+            sites_tile = sites_gdf.to_crs(_stack_crs(onset))
+            iy, ix, inside = _nearest_pixels(onset,sites_tile.geometry.x.values,sites_tile.geometry.y.values)
+            station_pixels[tile] = (sites_tile[inside], iy[inside], ix[inside])
+        sites_tile, iy, ix = station_pixels[tile]
+        if len(sites_tile) == 0:
+            continue
+        onset_at_sites = onset.isel(y=xr.DataArray(iy,dims='site'),x=xr.DataArray(ix,dims='site'))
+        if np.issubdtype(onset_at_sites.dtype,np.datetime64):
+            onset_at_sites = onset_at_sites.dt.dayofyear
+        frame = pd.DataFrame({'tile':tile,'year':year,'orbit':orbit,
+                              'site':sites_tile['code'].values,
+                              'elevation_m':sites_tile['elevation_m'].values.astype('float64'),
+                              'onset_doy':np.asarray(onset_at_sites.values,dtype='float64')})
+        frame['onset_date'] = pd.Timestamp(f'{year}-01-01')+pd.to_timedelta(frame['onset_doy']-1,unit='D')
+        melt_year = [melt_dates[code].loc[year] if year in melt_dates[code].index else None for code in frame['site']]
+        frame['melt_out_date'] = [_naive_day(m['melt_out_date']) if m is not None else pd.NaT for m in melt_year]
+        frame['peak_swe_date'] = [_naive_day(m['peak_swe_date']) if m is not None else pd.NaT for m in melt_year]
+        frames.append(frame)
+    columns = ['tile','year','orbit','site','elevation_m','onset_doy','onset_date','melt_out_date','peak_swe_date']
+    stations_df = pd.concat(frames,ignore_index=True) if frames else pd.DataFrame(columns=columns)
+    for column in ['onset_date','melt_out_date','peak_swe_date']:
+        stations_df[column] = pd.to_datetime(stations_df[column])
+    stations_df['elevation_band'] = np.floor(stations_df['elevation_m'].astype('float64')/bin_size)*bin_size+bin_size/2
+    stations_df['onset_minus_melt_out'] = (stations_df['onset_date']-stations_df['melt_out_date']).dt.days
+    stations_df['onset_minus_peak_swe'] = (stations_df['onset_date']-stations_df['peak_swe_date']).dt.days
+    return stations_df
+
+
+def summarize_validation(stations_df,by=('year','elevation_band','orbit')):
+    '''
+    Returns bias, MAE and RMSE of onset vs. melt-out and vs. peak SWE grouped by the given columns.
+
+            Parameters:
+                    stations_df (pandas DataFrame): validate_runoff_onset() output
+                    by (tuple): columns to group by, e.g. ('year',), ('elevation_band',) or ('year','elevation_band','orbit')
+
+            Returns:
+                    summary_df (pandas DataFrame): n, bias, mae and rmse [days] for each error column and group
+    '''
+    summaries = {}
+    for error in ['onset_minus_melt_out','onset_minus_peak_swe']:
+        grouped = stations_df.dropna(subset=[error]).groupby(list(by))[error]
+        summaries[error] = pd.DataFrame({'n':grouped.count(),
+                                         'bias':grouped.mean(),
+                                         'mae':grouped.apply(lambda e: e.abs().mean()),
+                                         'rmse':grouped.apply(lambda e: np.sqrt((e**2).mean()))})
+    summary_df = pd.concat(summaries,axis=1)
+    return summary_df